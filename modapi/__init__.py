@@ -9,17 +9,25 @@ from dotenv import load_dotenv
 
 __version__ = '0.1.6'
 
-# Configure logging
-logging.basicConfig(
-    level=os.environ.get('LOG_LEVEL', 'INFO'),
-    format=os.environ.get(
-        'LOG_FORMAT',
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-)
 logger = logging.getLogger(__name__)
 
 
+def configure_logging():
+    """
+    Configure root logging from LOG_LEVEL and LOG_FORMAT.
+    
+    Called by the command-line entry points; applications embedding modapi
+    configure logging themselves.
+    """
+    logging.basicConfig(
+        level=os.environ.get('LOG_LEVEL', 'INFO'),
+        format=os.environ.get(
+            'LOG_FORMAT',
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+    )
+
+
 def load_env_files():
     """Load environment variables from .env files in project directories."""
     # Try to load from current directory
@@ -8,7 +8,7 @@ import argparse
 import logging
 import json
 
-from . import load_env_files
+from . import load_env_files, configure_logging
 from .api.rest import create_rest_app
 from .api.mqtt import start_mqtt_broker
 from .api.shell import interactive_mode
@@ -20,9 +20,8 @@ from .api.rtu import (
     test_rtu_connection,
     create_rtu_client
 )
+from .rtu.utils import find_first_device
 
-# Import configuration
-from .config import PRIORITIZED_BAUDRATES
 # Import configuration variables
 from .config import BAUDRATES, PRIORITIZED_BAUDRATES, AUTO_DETECT_UNIT_IDS
 
@@ -45,31 +44,12 @@ def auto_detect_modbus_port(baudrates=None, debug=False, unit_id=None):
     if debug:
         print(f"Scanning {len(ports)} serial ports...")
     
-    for port in ports:
-        if debug:
-            print(f"\nChecking port: {port}")
-        
-        for baudrate in baudrates:
-            if debug:
-                print(f"  Trying baudrate: {baudrate}")
-            
-            try:
-                # Test with the specified unit ID or default to 1
-                test_unit_id = unit_id if unit_id is not None else 1
-                if test_modbus_port(port, baudrate=baudrate, unit_id=test_unit_id):
-                    if debug:
-                        print(f"✅ Found Modbus device on {port} at {baudrate} baud")
-                    return {
-                        'port': port,
-                        'baudrate': baudrate,
-                        'unit_id': test_unit_id
-                    }
-            except Exception as e:
-                if debug:
-                    print(f"    Error: {str(e)}")
-                continue
-    
-    return None
+    # Test with the specified unit ID or default to 1
+    test_unit_id = unit_id if unit_id is not None else 1
+    result = find_first_device(ports, baudrates, [test_unit_id])
+    if result is not None and debug:
+        print(f"✅ Found Modbus device on {result['port']} at {result['baudrate']} baud")
+    return result
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -78,6 +58,7 @@ def main():
     """Main entry point for the modapi module"""
     # Load environment variables
     load_env_files()
+    configure_logging()
     
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='modapi - Unified API for Modbus communication')
@@ -194,10 +175,10 @@ def main():
     elif args.command == 'scan':
         # Configure logging based on debug flag
         if args.debug:
-            logging.basicConfig(level=logging.DEBUG)
+            logging.getLogger().setLevel(logging.DEBUG)
             logger.setLevel(logging.DEBUG)
         else:
-            logging.basicConfig(level=logging.INFO)
+            logging.getLogger().setLevel(logging.INFO)
             logger.setLevel(logging.INFO)
             
         # Parse ports, baudrates, and unit IDs from arguments
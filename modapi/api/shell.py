@@ -15,7 +15,8 @@ def auto_detect_modbus_port():
     from ..api.rtu import find_serial_ports, test_modbus_port
     ports = find_serial_ports()
     for port in ports:
-        if test_modbus_port(port):
+        success, _ = test_modbus_port(port)
+        if success:
             return port
     return None
 
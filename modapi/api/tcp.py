@@ -5,13 +5,31 @@ Komunikacja Modbus TCP przez Ethernet
 
 import socket
 import struct
+import functools
 import time
 import logging
-from typing import Optional, List, Tuple, Dict, Any
+from typing import Optional, List, Tuple, Dict, Any, Union
 from threading import Lock
 
+from modapi.pdu import coalesce_ranges, unpack_coils
+
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Modbus function codes used on the request hot path
+_FC_READ_COILS = 0x01
+_FC_READ_DISCRETE_INPUTS = 0x02
+_FC_READ_HOLDING = 0x03
+_FC_READ_INPUT = 0x04
+_FC_WRITE_SINGLE_COIL = 0x05
+_FC_WRITE_SINGLE_REGISTER = 0x06
+_FC_WRITE_MULTIPLE_COILS = 0x0F
+_FC_WRITE_MULTIPLE_REGISTERS = 0x10
+
 
 class ModbusTCP:
     """
@@ -19,6 +37,19 @@ class ModbusTCP:
     Komunikacja Modbus TCP przez Ethernet
     """
     
+    # Modbus function codes
+    FUNC_READ_COILS = _FC_READ_COILS
+    FUNC_READ_DISCRETE_INPUTS = _FC_READ_DISCRETE_INPUTS
+    FUNC_READ_HOLDING_REGISTERS = _FC_READ_HOLDING
+    FUNC_READ_INPUT_REGISTERS = _FC_READ_INPUT
+    FUNC_WRITE_SINGLE_COIL = _FC_WRITE_SINGLE_COIL
+    FUNC_WRITE_SINGLE_REGISTER = _FC_WRITE_SINGLE_REGISTER
+    FUNC_WRITE_MULTIPLE_COILS = _FC_WRITE_MULTIPLE_COILS
+    FUNC_WRITE_MULTIPLE_REGISTERS = _FC_WRITE_MULTIPLE_REGISTERS
+    
+    # Address/value pair used by single write requests and their echo
+    _S_HH = struct.Struct('>HH')
+    
     def __init__(self, 
                  host: str = '192.168.1.100',
                  port: int = 502,
@@ -42,15 +73,9 @@ class ModbusTCP:
         self.lock = Lock()  # Thread safety
         self.transaction_id = 0
         
-        # Modbus function codes
-        self.FUNC_READ_COILS = 0x01
-        self.FUNC_READ_DISCRETE_INPUTS = 0x02
-        self.FUNC_READ_HOLDING_REGISTERS = 0x03
-        self.FUNC_READ_INPUT_REGISTERS = 0x04
-        self.FUNC_WRITE_SINGLE_COIL = 0x05
-        self.FUNC_WRITE_SINGLE_REGISTER = 0x06
-        self.FUNC_WRITE_MULTIPLE_COILS = 0x0F
-        self.FUNC_WRITE_MULTIPLE_REGISTERS = 0x10
+        # Register reads specialized per function code
+        self._read_holding = functools.partial(self._read_u16_block, _FC_READ_HOLDING)
+        self._read_input = functools.partial(self._read_u16_block, _FC_READ_INPUT)
         
         logger.info(f"Initialized ModbusTCP for {host}:{port}")
     
@@ -197,7 +222,8 @@ class ModbusTCP:
             with self.lock:
                 # Build and send request
                 request = self._build_request(unit_id, function_code, data)
-                logger.debug(f"Sending TCP: {request.hex()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sending TCP: %s", request.hex())
                 self.socket.send(request)
                 
                 # Read response header first
@@ -223,7 +249,8 @@ class ModbusTCP:
                     pdu_data += chunk
                 
                 response = header_data + pdu_data
-                logger.debug(f"Received TCP: {response.hex()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Received TCP: %s", response.hex())
                 
                 # Parse response
                 return self._parse_response(response, function_code)
@@ -232,6 +259,31 @@ class ModbusTCP:
             logger.error(f"TCP communication error: {e}")
             return None
     
+    def _decode_register_response(self, response_data: bytes, count: int, as_array: bool = False):
+        """
+        Decode register values from a read registers response
+        
+        The register count is already validated by the caller, so the byte
+        count field on the wire is not re-read; the payload starts at offset 1.
+        
+        Args:
+            response_data: Response data (byte count followed by register data)
+            count: Number of registers requested
+            as_array: Return a read-only big-endian ('>u2') numpy view of the
+                response bytes instead of a list (no copy is made)
+            
+        Returns:
+            List of register values (or numpy array), None if response is too short
+        """
+        if len(response_data) < 1 + 2 * count:
+            logger.error(f"Registers response too short: {len(response_data)} bytes for {count} registers")
+            return None
+        
+        if as_array:
+            return np.frombuffer(response_data, dtype='>u2', count=count, offset=1)
+        
+        return list(struct.unpack_from(f'>{count}H', response_data, 1))
+    
     def read_coils(self, unit_id: Optional[int] = None, address: int = 0, count: int = 1) -> Optional[List[bool]]:
         """
         Read coils (function code 0x01)
@@ -255,7 +307,7 @@ class ModbusTCP:
         data = struct.pack('>HH', address, count)
         
         # Send request
-        response_data = self._send_request(unit_id, self.FUNC_READ_COILS, data)
+        response_data = self._send_request(unit_id, _FC_READ_COILS, data)
         if response_data is None:
             return None
         
@@ -264,34 +316,34 @@ class ModbusTCP:
             byte_count = response_data[0]
             coil_data = response_data[1:1+byte_count]
             
-            # Convert bytes to boolean list
-            coils = []
-            for i in range(count):
-                byte_index = i // 8
-                bit_index = i % 8
-                if byte_index < len(coil_data):
-                    coils.append(bool(coil_data[byte_index] & (1 << bit_index)))
-                else:
-                    coils.append(False)
-            
+            # Convert bytes to boolean list (same table-driven decoder as RTU),
+            # padding coils missing from a short response with False
+            coils = unpack_coils(coil_data, count)
+            coils.extend([False] * (count - len(coils)))
             return coils
             
         except Exception as e:
             logger.error(f"Error parsing coils response: {e}")
             return None
     
-    def read_holding_registers(self, unit_id: Optional[int] = None, address: int = 0, count: int = 1) -> Optional[List[int]]:
+    def _read_u16_block(self, function_code: int, unit_id: Optional[int], address: int, count: int,
+                        as_array: bool = False):
         """
-        Read holding registers (function code 0x03)
+        Read a block of 16-bit registers (shared by function codes 0x03 and 0x04)
         
         Args:
+            function_code: Read function code
             unit_id: Unit identifier (uses default if None)
             address: Starting address
             count: Number of registers to read
+            as_array: Return a zero-copy '>u2' numpy view instead of a list
             
         Returns:
-            Optional[List[int]]: List of register values or None if error
+            List of register values (or numpy array), None if error
         """
+        if as_array and np is None:
+            raise ImportError("numpy is required for as_array=True. Install with: pip install numpy")
+        
         if unit_id is None:
             unit_id = self.unit_id
             
@@ -300,30 +352,78 @@ class ModbusTCP:
             return None
         
         # Build request data
-        data = struct.pack('>HH', address, count)
+        data = self._S_HH.pack(address, count)
         
         # Send request
-        response_data = self._send_request(unit_id, self.FUNC_READ_HOLDING_REGISTERS, data)
+        response_data = self._send_request(unit_id, function_code, data)
         if response_data is None:
             return None
         
-        try:
-            # Parse response
-            byte_count = response_data[0]
-            register_data = response_data[1:1+byte_count]
+        return self._decode_register_response(response_data, count, as_array)
+    
+    def read_holding_registers(self, unit_id: Optional[int] = None, address: int = 0, count: int = 1,
+                              as_array: bool = False) -> Optional[Union[List[int], 'np.ndarray']]:
+        """
+        Read holding registers (function code 0x03)
+        
+        Args:
+            unit_id: Unit identifier (uses default if None)
+            address: Starting address
+            count: Number of registers to read
+            as_array: Return a zero-copy big-endian ('>u2') numpy view of the
+                response instead of a list (requires numpy)
             
-            # Convert bytes to register values
-            registers = []
-            for i in range(0, len(register_data), 2):
-                if i + 1 < len(register_data):
-                    value = struct.unpack('>H', register_data[i:i+2])[0]
-                    registers.append(value)
+        Returns:
+            Optional[Union[List[int], np.ndarray]]: Register values or None if error
+        """
+        return self._read_holding(unit_id, address, count, as_array)
+    
+    def read_input_registers(self, unit_id: Optional[int] = None, address: int = 0, count: int = 1,
+                              as_array: bool = False) -> Optional[Union[List[int], 'np.ndarray']]:
+        """
+        Read input registers (function code 0x04)
+        
+        Args:
+            unit_id: Unit identifier (uses default if None)
+            address: Starting address
+            count: Number of registers to read
+            as_array: Return a zero-copy big-endian ('>u2') numpy view of the
+                response instead of a list (requires numpy)
             
-            return registers
+        Returns:
+            Optional[Union[List[int], np.ndarray]]: Register values or None if error
+        """
+        return self._read_input(unit_id, address, count, as_array)
+    
+    def read_holding_registers_multi(self, unit_id: Optional[int], requests: List[Tuple[int, int]],
+                                     max_gap: int = 0) -> List[List[int]]:
+        """
+        Read several holding register ranges with as few requests as possible
+        
+        Same contract as the RTU read_holding_registers_multi: overlapping and
+        nearby ranges are merged into windows of at most 125 registers, each
+        costing a single request, and the values are sliced back per range.
+        
+        Args:
+            unit_id: Unit identifier (uses default if None)
+            requests: List of (address, count) tuples
+            max_gap: Maximum number of unrequested registers read to join ranges
             
-        except Exception as e:
-            logger.error(f"Error parsing registers response: {e}")
-            return None
+        Returns:
+            List[List[int]]: Register values per request, in request order
+            (empty list for ranges that could not be read)
+        """
+        results: List[List[int]] = [[] for _ in requests]
+        for start, count, indexes in coalesce_ranges(requests, max_gap):
+            values = self.read_holding_registers(unit_id, start, count)
+            if values is None:
+                continue
+            values = list(values)
+            for index in indexes:
+                address, length = requests[index]
+                results[index] = values[address - start:address - start + length]
+        
+        return results
     
     def write_single_coil(self, unit_id: Optional[int] = None, address: int = 0, value: bool = False) -> bool:
         """
@@ -342,20 +442,18 @@ class ModbusTCP:
             
         # Build request data
         coil_value = 0xFF00 if value else 0x0000
-        data = struct.pack('>HH', address, coil_value)
+        data = self._S_HH.pack(address, coil_value)
         
         # Send request
-        response_data = self._send_request(unit_id, self.FUNC_WRITE_SINGLE_COIL, data)
+        response_data = self._send_request(unit_id, _FC_WRITE_SINGLE_COIL, data)
         if response_data is None:
             return False
         
-        # Validate echo response
-        try:
-            resp_address, resp_value = struct.unpack('>HH', response_data)
-            return resp_address == address and resp_value == coil_value
-        except Exception as e:
-            logger.error(f"Error validating coil write response: {e}")
+        # Validate echo response (a short or malformed echo simply compares unequal)
+        if response_data != data:
+            logger.error(f"Invalid coil write echo: {response_data.hex()}")
             return False
+        return True
     
     def write_single_register(self, unit_id: Optional[int] = None, address: int = 0, value: int = 0) -> bool:
         """
@@ -372,21 +470,20 @@ class ModbusTCP:
         if unit_id is None:
             unit_id = self.unit_id
             
-        # Build request data
-        data = struct.pack('>HH', address, value & 0xFFFF)
+        # Build request data; the echo response must match it byte for byte
+        value &= 0xFFFF
+        data = self._S_HH.pack(address, value)
         
         # Send request
-        response_data = self._send_request(unit_id, self.FUNC_WRITE_SINGLE_REGISTER, data)
+        response_data = self._send_request(unit_id, _FC_WRITE_SINGLE_REGISTER, data)
         if response_data is None:
             return False
         
-        # Validate echo response
-        try:
-            resp_address, resp_value = struct.unpack('>HH', response_data)
-            return resp_address == address and resp_value == (value & 0xFFFF)
-        except Exception as e:
-            logger.error(f"Error validating register write response: {e}")
+        # Validate echo response (a short or malformed echo simply compares unequal)
+        if response_data != data:
+            logger.error(f"Invalid register write echo: {response_data.hex()}")
             return False
+        return True
     
     def test_connection(self, unit_id: Optional[int] = None) -> Tuple[bool, Dict[str, Any]]:
         """
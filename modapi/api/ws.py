@@ -49,7 +49,7 @@ class ModbusConnectionPool:
         if rs485_delay <= 0:
             return
             
-        current_time = time.time()
+        current_time = time.monotonic()
         time_since_last_op = current_time - self._last_operation_time
         
         if time_since_last_op < rs485_delay:
@@ -59,7 +59,7 @@ class ModbusConnectionPool:
                 time.sleep(delay_needed)
                 
         # Update last operation time at the pool level
-        self._last_operation_time = time.time()
+        self._last_operation_time = time.monotonic()
     
     def get_connection(self, port: str, baudrate: int = DEFAULT_BAUDRATE,
                       timeout: float = DEFAULT_TIMEOUT, **kwargs) -> ModbusRTU:
@@ -87,7 +87,7 @@ class ModbusConnectionPool:
             # Check if connection exists and is connected
             if key in self.connections and self.connections[key].is_connected():
                 client = self.connections[key]
-                self.last_used[key] = time.time()
+                self.last_used[key] = time.monotonic()
                 # Update the client's internal _last_operation_time to match the pool
                 client._last_operation_time = self._last_operation_time
                 return client
@@ -98,7 +98,7 @@ class ModbusConnectionPool:
             
             if success:
                 self.connections[key] = client
-                self.last_used[key] = time.time()
+                self.last_used[key] = time.monotonic()
                 # Update the client's internal _last_operation_time to match the pool
                 client._last_operation_time = self._last_operation_time
                 
@@ -122,7 +122,7 @@ class ModbusConnectionPool:
         key = f"{port}:{baudrate}"
         with self.lock:
             if key in self.connections:
-                self.last_used[key] = time.time()
+                self.last_used[key] = time.monotonic()
                 # Update the pool's last operation time from the client
                 if hasattr(self.connections[key], '_last_operation_time'):
                     self._last_operation_time = max(self._last_operation_time, 
@@ -168,7 +168,7 @@ class ModbusConnectionPool:
         Args:
             max_idle_time: Maximum idle time in seconds
         """
-        current_time = time.time()
+        current_time = time.monotonic()
         
         with self.lock:
             for key in list(self.last_used.keys()):
@@ -6,6 +6,7 @@ Loads constants and settings from JSON files and environment variables
 import json
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
@@ -18,8 +19,9 @@ CONFIG_DIR = Path(__file__).parent.parent / 'config'
 
 # ====== Function Definitions ======
 
+@lru_cache(maxsize=1)
 def _load_constants():
-    """Load constants from JSON file"""
+    """Load constants from JSON file (parsed once; call _load_constants.cache_clear() to reload)"""
     try:
         file_path = CONFIG_DIR / 'constants.json'
         if file_path.exists():
@@ -64,8 +66,9 @@ def get_analog_input_types():
         "TYPE_4_20MA": 0x03
     })
 
+@lru_cache(maxsize=None)
 def load_json_config(filename: str) -> Dict[str, Any]:
-    """Load configuration from a JSON file"""
+    """Load configuration from a JSON file (parsed once per file; call load_json_config.cache_clear() to reload)"""
     try:
         file_path = CONFIG_DIR / filename
         if not file_path.exists():
@@ -0,0 +1,60 @@
+"""
+Modbus PDU Helpers
+Transport-neutral encoding helpers shared by the RTU and TCP clients
+"""
+
+from typing import List, Tuple
+
+# Coil states per byte value, least significant bit (lowest address) first.
+# Faster than numpy.unpackbits for every frame size once .tolist() is counted
+_COIL_BITS = tuple(tuple(bool(byte >> bit & 1) for bit in range(8)) for byte in range(256))
+
+def unpack_coils(data: bytes, count: int = None) -> List[bool]:
+    """
+    Expand packed coil bytes into coil states
+    
+    Args:
+        data: Coil bytes, lowest address in the least significant bit
+        count: Number of coils to return (default: all bits)
+        
+    Returns:
+        List[bool]: Coil states in address order
+    """
+    if count is not None:
+        data = data[:(count + 7) >> 3]  # Only the bytes holding the requested coils
+    coils = []
+    for byte_val in data:
+        coils.extend(_COIL_BITS[byte_val])
+    if count is not None:
+        del coils[count:]  # Trim in place instead of copying
+    return coils
+
+def coalesce_ranges(ranges: List[Tuple[int, int]], max_gap: int = 0,
+                    max_count: int = 125) -> List[Tuple[int, int, List[int]]]:
+    """
+    Merge (address, count) ranges into as few read windows as possible
+    
+    Ranges are sorted by address; a range joins the previous window when it
+    overlaps it or starts at most ``max_gap`` addresses after its end, and the
+    merged window still fits in ``max_count`` items.
+    
+    Args:
+        ranges: List of (address, count) tuples
+        max_gap: Maximum number of unrequested addresses read to join two ranges
+        max_count: Maximum items per window (125 registers or 2000 coils)
+        
+    Returns:
+        List[Tuple[int, int, List[int]]]: (start, count, indexes into ranges) per window
+    """
+    windows = []
+    for index in sorted(range(len(ranges)), key=lambda i: ranges[i][0]):
+        address, count = ranges[index]
+        end = address + count
+        if windows:
+            start, window_end, indexes = windows[-1]
+            if address <= window_end + max_gap and max(end, window_end) - start <= max_count:
+                windows[-1] = (start, max(end, window_end), indexes)
+                indexes.append(index)
+                continue
+        windows.append((address, end, [index]))
+    return [(start, end - start, indexes) for start, end, indexes in windows]
@@ -3,9 +3,12 @@ Modbus RTU Package
 Modular implementation of Modbus RTU protocol with Waveshare device support
 """
 
+import sys
+
 # Core classes
-from .base import ModbusRTU
+from .base import ModbusRTU, invalidate_port_cache
 from .client import ModbusRTUClient
+from .async_client import AsyncModbusRTU, scan_for_devices_async
 
 # Protocol functions
 from .protocol import (
@@ -27,105 +30,93 @@ from .utils import (
     find_serial_ports,
     test_modbus_port,
     scan_for_devices,
-    detect_device_type,
-    test_rtu_connection
+    find_first_device,
+    detect_device_type
 )
 
-# Import configuration
+# Import configuration (function code constants come from .protocol above)
 from modapi.config import (
     DEFAULT_PORT, DEFAULT_BAUDRATE, DEFAULT_TIMEOUT, DEFAULT_UNIT_ID,
-    READ_COILS, READ_DISCRETE_INPUTS,
-    READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS,
-    WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER,
-    WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS,
     BAUDRATES, PRIORITIZED_BAUDRATES
 )
 
 # Device-specific classes
 from .devices import WaveshareIO8CH, WaveshareAnalogInput8CH
 
-# Import compatibility functions from the parent module
-import sys
-import os
-
-parent_dir = os.path.dirname(os.path.dirname(__file__))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+# Convenience functions for backward compatibility
+def create_rtu_client(port: str = DEFAULT_PORT,
+                      baudrate: int = DEFAULT_BAUDRATE,
+                      timeout: float = DEFAULT_TIMEOUT):
+    """Create RTU client instance"""
+    client = ModbusRTUClient(port=port, baudrate=baudrate, timeout=timeout)
+    client.connect()
+    return client
 
-# Import compatibility functions from the original rtu.py
-# We need to do this in a try/except block to avoid circular imports
-try:
-    from ..rtu import test_rtu_connection, create_rtu_client
-except ImportError:
-    # Define the functions here as a fallback
-    def create_rtu_client(port: str = DEFAULT_PORT,
-                          baudrate: int = DEFAULT_BAUDRATE,
-                          timeout: float = DEFAULT_TIMEOUT):
-        """Create RTU client instance"""
-        client = ModbusRTUClient(port=port, baudrate=baudrate, timeout=timeout)
-        client.connect()
-        return client
 
+def test_rtu_connection(port: str = '/dev/ttyACM0',
+                        baudrate: int = 57600,
+                        unit_id: int = 1):
+    """Test RTU connection quickly"""
+    result = {
+        'port': port,
+        'baudrate': baudrate,
+        'unit_id': unit_id,
+        'success': False,
+        'error': None
+    }
 
-    def test_rtu_connection(port: str = '/dev/ttyACM0',
-                            baudrate: int = 57600,
-                            unit_id: int = 1):
-        """Test RTU connection quickly"""
-        result = {
-            'port': port,
-            'baudrate': baudrate,
-            'unit_id': unit_id,
-            'success': False,
-            'error': None
-        }
+    try:
+        # Special case for pytest environment
+        if 'pytest' in sys.modules:
+            # In test environment, just return success without trying to connect
+            result.update({
+                'success': True,
+                'connected': True,
+                'device_type': 'TestDevice',
+                'test_environment': True
+            })
+            return result['success'], result
 
-        try:
-            # Special case for pytest environment
-            if 'pytest' in sys.modules:
-                # In test environment, just return success without trying to connect
-                result.update({
-                    'success': True,
-                    'connected': True,
-                    'device_type': 'TestDevice',
-                    'test_environment': True
-                })
-                return result['success'], result
-
-            # Normal operation
-            client = ModbusRTUClient(port=port, baudrate=baudrate, timeout=1.0)
-            if client.connect():
-                # Try to read a register to verify connection
-                response = client.read_holding_registers(0, 1, unit_id)
-                if response is not None:
-                    result['success'] = True
-                else:
-                    result['error'] = "No response from device"
-                client.disconnect()
+        # Normal operation
+        client = ModbusRTUClient(port=port, baudrate=baudrate, timeout=1.0)
+        if client.connect():
+            # Try to read a register to verify connection
+            response = client.read_holding_registers(0, 1, unit_id)
+            if response is not None:
+                result['success'] = True
             else:
-                result['error'] = "Failed to connect to port"
-        except Exception as e:
-            result['error'] = str(e)
+                result['error'] = "No response from device"
+            client.disconnect()
+        else:
+            result['error'] = "Failed to connect to port"
+    except Exception as e:
+        result['error'] = str(e)
+
+    return result['success'], result
 
-        return result['success'], result
 
 # For backward compatibility with existing code
 __all__ = [
     'ModbusRTU',
     'ModbusRTUClient',
-    'FUNC_READ_COILS',
-    'FUNC_READ_DISCRETE_INPUTS',
-    'FUNC_READ_HOLDING_REGISTERS',
-    'FUNC_READ_INPUT_REGISTERS',
-    'FUNC_WRITE_SINGLE_COIL',
-    'FUNC_WRITE_SINGLE_REGISTER',
-    'FUNC_WRITE_MULTIPLE_COILS',
-    'FUNC_WRITE_MULTIPLE_REGISTERS',
+    'AsyncModbusRTU',
+    'scan_for_devices_async',
+    'invalidate_port_cache',
+    'READ_COILS',
+    'READ_DISCRETE_INPUTS',
+    'READ_HOLDING_REGISTERS',
+    'READ_INPUT_REGISTERS',
+    'WRITE_SINGLE_COIL',
+    'WRITE_SINGLE_REGISTER',
+    'WRITE_MULTIPLE_COILS',
+    'WRITE_MULTIPLE_REGISTERS',
     'calculate_crc',
     'validate_crc',
     'try_alternative_crcs',
     'find_serial_ports',
     'test_modbus_port',
     'scan_for_devices',
+    'find_first_device',
     'detect_device_type',
     'WaveshareIO8CH',
     'WaveshareAnalogInput8CH',
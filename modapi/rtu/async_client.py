@@ -0,0 +1,310 @@
+"""
+Asynchronous Modbus RTU Client
+Overlaps the response waits of many serial ports on a single event loop
+"""
+
+import asyncio
+import logging
+import os
+from typing import List, Optional, Dict, Any
+
+import serial
+
+from .crc import validate_crc
+from .protocol import (
+    READ_COILS, READ_DISCRETE_INPUTS,
+    READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS,
+    WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER,
+    EXCEPTION_RESPONSE_SIZE,
+    build_read_request, build_write_single_coil_request,
+    build_write_single_register_request, expected_response_length,
+    is_compatible_function_code, parse_read_coils_response,
+    parse_read_registers_response
+)
+from .utils import find_serial_ports, set_low_latency
+from modapi.config import (
+    DEFAULT_BAUDRATE, DEFAULT_TIMEOUT,
+    PRIORITIZED_BAUDRATES, AUTO_DETECT_UNIT_IDS
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncModbusRTU:
+    """
+    Modbus RTU client for asyncio applications
+
+    The port's file descriptor is watched with loop.add_reader(), so waiting
+    for a response does not block a thread. Transactions on one port are
+    serialized; transactions on different ports overlap freely.
+
+    Requires an event loop with add_reader() support (the default loop on
+    Linux and macOS; not the Windows proactor loop).
+    """
+
+    def __init__(self, port: str, baudrate: int = DEFAULT_BAUDRATE, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Initialize asynchronous Modbus RTU client
+
+        Args:
+            port: Serial port path
+            baudrate: Baud rate
+            timeout: Time to wait for a response in seconds
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.serial_conn = None
+        self._loop = None
+        self._lock = None
+        self._rx = bytearray()
+        self._rx_event = None
+
+    async def connect(self) -> bool:
+        """
+        Open the serial port and start watching it for incoming data
+
+        Returns:
+            bool: True if connected, False otherwise
+        """
+        if self.is_connected():
+            return True
+
+        try:
+            # timeout=0 makes the port non-blocking; the event loop does the waiting
+            self.serial_conn = serial.Serial(port=self.port, baudrate=self.baudrate, timeout=0)
+        except Exception as e:
+            logger.error(f"Failed to open {self.port}: {e}")
+            self.serial_conn = None
+            return False
+
+        set_low_latency(self.serial_conn)
+        self._loop = asyncio.get_running_loop()
+        self._lock = asyncio.Lock()
+        self._rx_event = asyncio.Event()
+        self._loop.add_reader(self.serial_conn.fileno(), self._on_readable)
+        return True
+
+    def disconnect(self) -> None:
+        """Stop watching the port and close it"""
+        if self.serial_conn is None:
+            return
+        try:
+            self._loop.remove_reader(self.serial_conn.fileno())
+        except Exception as e:
+            logger.debug("Could not remove reader for %s: %s", self.port, e)
+        self.serial_conn.close()
+        self.serial_conn = None
+
+    def is_connected(self) -> bool:
+        """Check if the port is open"""
+        return self.serial_conn is not None and self.serial_conn.is_open
+
+    async def __aenter__(self):
+        if not await self.connect():
+            raise ConnectionError(f"Failed to connect to {self.port}")
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.disconnect()
+
+    def set_baudrate(self, baudrate: int) -> None:
+        """Switch the open port to another baud rate"""
+        self.baudrate = baudrate
+        if self.serial_conn is not None:
+            self.serial_conn.baudrate = baudrate
+
+    def _on_readable(self) -> None:
+        """Event loop callback: move the bytes that arrived into the receive buffer"""
+        try:
+            data = os.read(self.serial_conn.fileno(), 256)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.warning("Read from %s failed, closing the port: %s", self.port, e)
+            data = b''
+        if data:
+            self._rx.extend(data)
+            self._rx_event.set()
+            return
+        # Hang-up (EIO or end of file, e.g. the USB adapter was unplugged): the fd
+        # stays readable, so stop watching it and wake a waiting _receive()
+        self.disconnect()
+        self._rx_event.set()
+
+    async def _receive(self, expected_length: Optional[int]) -> bytes:
+        """
+        Wait for one response frame
+
+        Completes as soon as the expected number of bytes (or a complete
+        exception response) has arrived. Frames of unknown length end after
+        3.5 character times of silence.
+        """
+        t35 = 3.5 * 11 / self.baudrate if self.baudrate <= 19200 else 0.00175
+        deadline = self._loop.time() + self.timeout
+
+        while self.serial_conn is not None:  # None after a hang-up
+            rx = self._rx
+            if expected_length and len(rx) >= 2:
+                wanted = EXCEPTION_RESPONSE_SIZE if rx[1] & 0x80 else expected_length
+                if len(rx) >= wanted:
+                    break
+
+            if rx and not expected_length:
+                wait = t35
+            else:
+                wait = deadline - self._loop.time()
+                if wait <= 0:
+                    break
+
+            self._rx_event.clear()
+            try:
+                await asyncio.wait_for(self._rx_event.wait(), wait)
+            except asyncio.TimeoutError:
+                break
+
+        frame = bytes(self._rx)
+        self._rx.clear()
+        return frame
+
+    async def send_request(self, request: bytes, unit_id: int, function_code: int) -> Optional[bytes]:
+        """
+        Send a request and wait for its validated response
+
+        Args:
+            request: Complete request frame including CRC
+            unit_id: Unit ID the response must come from
+            function_code: Function code of the request
+
+        Returns:
+            Optional[bytes]: Response frame, or None on timeout, invalid frame
+            or exception response
+        """
+        if not self.is_connected() and not await self.connect():
+            return None
+
+        async with self._lock:
+            if self.serial_conn is None:  # Hung up while waiting for the lock
+                return None
+            # Drop anything left over from an earlier, timed-out transaction
+            self._rx.clear()
+            self.serial_conn.write(request)
+            response = await self._receive(expected_response_length(function_code, request))
+
+        if len(response) < EXCEPTION_RESPONSE_SIZE:
+            if response:
+                logger.debug("Short response from unit %s on %s: %s", unit_id, self.port, response.hex())
+            return None
+        if unit_id != 0 and response[0] != unit_id:
+            logger.debug("Response from unit %s while waiting for unit %s on %s", response[0], unit_id, self.port)
+            return None
+        if not validate_crc(response)[0]:
+            logger.debug("CRC error in response from unit %s on %s", unit_id, self.port)
+            return None
+        if response[1] & 0x80:
+            logger.debug("Exception %s from unit %s on %s", response[2], unit_id, self.port)
+            return None
+        if not is_compatible_function_code(response[1], function_code):
+            return None
+        return response
+
+    async def _read_registers(self, function_code: int, unit_id: int, address: int,
+                              count: int) -> Optional[List[int]]:
+        request = build_read_request(unit_id, function_code, address, count)
+        response = await self.send_request(request, unit_id, function_code)
+        if response is None:
+            return None
+        success, values = parse_read_registers_response(response[2:-2], count)
+        return values if success else None
+
+    async def _read_bits(self, function_code: int, unit_id: int, address: int,
+                         count: int) -> Optional[List[bool]]:
+        request = build_read_request(unit_id, function_code, address, count)
+        response = await self.send_request(request, unit_id, function_code)
+        if response is None:
+            return None
+        return parse_read_coils_response(response[2:-2])[:count]
+
+    async def read_coils(self, unit_id: int, address: int, count: int) -> Optional[List[bool]]:
+        """Read coil states (None if the device did not answer)"""
+        return await self._read_bits(READ_COILS, unit_id, address, count)
+
+    async def read_discrete_inputs(self, unit_id: int, address: int, count: int) -> Optional[List[bool]]:
+        """Read discrete input states (None if the device did not answer)"""
+        return await self._read_bits(READ_DISCRETE_INPUTS, unit_id, address, count)
+
+    async def read_holding_registers(self, unit_id: int, address: int, count: int) -> Optional[List[int]]:
+        """Read holding register values (None if the device did not answer)"""
+        return await self._read_registers(READ_HOLDING_REGISTERS, unit_id, address, count)
+
+    async def read_input_registers(self, unit_id: int, address: int, count: int) -> Optional[List[int]]:
+        """Read input register values (None if the device did not answer)"""
+        return await self._read_registers(READ_INPUT_REGISTERS, unit_id, address, count)
+
+    async def write_single_coil(self, unit_id: int, address: int, value: bool) -> bool:
+        """Write single coil state"""
+        request = build_write_single_coil_request(unit_id, address, value)
+        return await self.send_request(request, unit_id, WRITE_SINGLE_COIL) is not None
+
+    async def write_single_register(self, unit_id: int, address: int, value: int) -> bool:
+        """Write single register value"""
+        request = build_write_single_register_request(unit_id, address, value)
+        return await self.send_request(request, unit_id, WRITE_SINGLE_REGISTER) is not None
+
+
+async def _scan_one_port_async(port: str, baudrates: List[int], unit_ids: List[int],
+                               timeout: float) -> Optional[Dict[str, Any]]:
+    """Scan a single port; the first answering baudrate wins"""
+    if not baudrates:
+        return None
+
+    client = AsyncModbusRTU(port, baudrates[0], timeout)
+    if not await client.connect():
+        return None
+    try:
+        for baudrate in baudrates:
+            client.set_baudrate(baudrate)
+            found = [unit_id for unit_id in unit_ids
+                     if await client.read_holding_registers(unit_id, 0, 1) is not None]
+            if found:
+                return {
+                    'port': port,
+                    'baudrate': baudrate,
+                    'unit_id': found[0],
+                    'unit_ids': found
+                }
+    finally:
+        client.disconnect()
+    return None
+
+
+async def scan_for_devices_async(ports: List[str] = None,
+                                 baudrates: List[int] = None,
+                                 unit_ids: List[int] = None,
+                                 timeout: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Scan for Modbus devices on all ports concurrently on the running event loop
+
+    Each port is probed independently, so the scan takes about as long as the
+    slowest port instead of the sum over all ports, without a thread per port.
+
+    Args:
+        ports: List of ports to scan (default: auto-detect)
+        baudrates: List of baudrates to try (default: from config.PRIORITIZED_BAUDRATES)
+        unit_ids: List of unit IDs to try (default: from config.AUTO_DETECT_UNIT_IDS)
+        timeout: Time to wait for each probe response in seconds
+
+    Returns:
+        List[Dict[str, Any]]: List of detected devices with configuration
+    """
+    if ports is None:
+        ports = find_serial_ports()
+    if baudrates is None:
+        baudrates = PRIORITIZED_BAUDRATES
+    if unit_ids is None:
+        unit_ids = AUTO_DETECT_UNIT_IDS
+
+    results = await asyncio.gather(*(_scan_one_port_async(port, baudrates, unit_ids, timeout) for port in ports))
+    detected_devices = [device for device in results if device is not None]
+    logger.info(f"Detected {len(detected_devices)} Modbus devices")
+    return detected_devices
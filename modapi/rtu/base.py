@@ -3,40 +3,80 @@ Base Modbus RTU Communication Module
 Core implementation of ModbusRTU class with essential functionality
 """
 
+import asyncio
+import errno
 import logging
+import queue
 import serial
 import time
-import struct
-from threading import Lock
-from typing import List, Optional, Union
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from functools import lru_cache, wraps
+from threading import Lock, Thread, current_thread
+from typing import Dict, List, Optional, Tuple, Union
 
 from . import crc
 from .protocol import (
-    build_request, parse_response, parse_read_coils_response, parse_read_registers_response,
+    build_request, parse_response, parse_read_registers_response,
     build_read_request, build_write_single_coil_request, build_write_single_register_request,
     build_write_multiple_coils_request, build_write_multiple_registers_request,
-    build_set_baudrate_request
+    build_set_baudrate_request, expected_response_length, EXCEPTION_RESPONSE_SIZE,
+    is_compatible_function_code, response_length_from_header, unpack_coils,
+    EXCEPTION_DESCRIPTIONS, FUNCTION_CODE_ALIASES, WAVESHARE_FUNC_READ_COILS,
+    WAVESHARE_FUNC_READ_HOLDING_REGISTERS, WAVESHARE_FUNC_READ_INPUT_REGISTERS
 )
+from .utils import (
+    set_low_latency, invalidate_serial_ports_cache, read_exact,
+    read_until_idle
+)
+from modapi.pdu import coalesce_ranges
 # No device state imports needed for now
 from modapi.config import (
     READ_COILS, READ_DISCRETE_INPUTS,
     READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS,
     WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER,
     WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS,
-    DEFAULT_RS485_DELAY, HIGHEST_PRIORITIZED_BAUDRATE, CONFIG_DIR
+    DEFAULT_RS485_DELAY, HIGHEST_PRIORITIZED_BAUDRATE, get_baudrates
 )
 
 logger = logging.getLogger(__name__)
 
+def _validate_count(limit: int, kind: str):
+    """Decorator for read methods: reject counts outside 1..limit with [] before touching the port"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, unit_id: int, address: int, count: int):
+            if count < 1 or count > limit:
+                self.device_logger.error("Invalid %s count: %s", kind, count)
+                return []
+            return func(self, unit_id, address, count)
+        return wrapper
+    return decorator
+
+
+class _PortState:
+    """Bus state shared by every ModbusRTU instance opened on the same port"""
+    __slots__ = ('lock', 'last_operation_time')
+    
+    def __init__(self):
+        self.lock = Lock()  # Serializes transactions on the physical port
+        self.last_operation_time = 0.0  # time.monotonic() of the last bus activity
+
+
+# Consecutive failed reads after which a unit is only probed under its own ID,
+# and for how long (seconds since its last failure) before the fallback unit
+# IDs are tried again, e.g. once a device that was powered off comes back
+_UNREACHABLE_AFTER = 3
+_UNREACHABLE_TTL = 30.0
+
+# Port path -> shared state (setdefault keeps creation race-free)
+_port_states: Dict[str, _PortState] = {}
+
 class ModbusRTU:
     """
     Direct RTU Modbus communication class
     Bezpośrednia komunikacja Modbus RTU przez port szeregowy
     """
     
-    # Class variable to track last operation time for RS485 delay
-    _last_operation_time = 0.0
-    
     # Function code constants for backward compatibility
     FUNC_READ_COILS = READ_COILS
     FUNC_READ_DISCRETE_INPUTS = READ_DISCRETE_INPUTS
@@ -53,7 +93,9 @@ class ModbusRTU:
                  timeout: float = 1.0,
                  rs485_delay: float = DEFAULT_RS485_DELAY,
                  device_logger: logging.Logger = None,
-                 enable_state_tracking: bool = False):
+                 enable_state_tracking: bool = False,
+                 strict_flush: bool = False,
+                 post_write_delay: float = 0.0):
         """
         Initialize ModbusRTU communication.
         
@@ -63,6 +105,10 @@ class ModbusRTU:
             timeout: Serial timeout in seconds
             rs485_delay: Delay between operations in seconds (default from config)
             device_logger: Logger for device-specific logs (if None, will use module logger)
+            strict_flush: Flush serial buffers before every request, even when no stale
+                input is pending (useful on noisy buses)
+            post_write_delay: Pause after sending a request before reading the response,
+                for slow devices that garble replies read too early (default: none)
         """
         self.port = port
         self.baudrate = baudrate if baudrate is not None else HIGHEST_PRIORITIZED_BAUDRATE
@@ -70,8 +116,48 @@ class ModbusRTU:
         self.rs485_delay = rs485_delay
         self.serial_conn = None
         self.device_logger = device_logger if device_logger is not None else logger
-        self.lock = Lock()  # Thread safety for serial operations
+        # Instances on the same port share its lock and RS485 timing; different
+        # ports (e.g. separate USB adapters) no longer wait on each other
+        self._port_state = _port_states.setdefault(port, _PortState())
+        self.lock = self._port_state.lock
         self.enable_state_tracking = enable_state_tracking
+        self.strict_flush = strict_flush
+        self.post_write_delay = post_write_delay
+        # Port-name checks are fixed for the instance's lifetime, so decide them once.
+        # Waveshare test/ACM ports tolerate unit ID, function code and CRC mismatches
+        self._is_test_port = port == '/dev/ttyTEST'
+        self._lenient_framing = self._is_test_port or (port or '').startswith('/dev/ttyACM')
+        
+        # (unit_id, read function) -> (unit_id, function_code) dialect that last answered
+        self._dialects = {}
+        # Pause before each fallback attempt, doubling per attempt and per
+        # consecutive failed read of the unit, so a silent device is not hammered
+        # back-to-back; capped low so detection stays fast
+        self._fallback_backoff_base = 0.01
+        self._fallback_backoff_cap = 0.05
+        # unit_id -> (consecutive reads where no dialect answered, monotonic time of the last)
+        self._unit_failures = {}
+        
+        # (unit_id, read function, address, count) -> (monotonic expiry, response bytes);
+        # disabled until set_read_ttl() or set_register_ttl() gives reads a lifetime
+        self._read_cache = {}
+        self._read_ttl = 0.0
+        # (unit_id or None for every unit, read function, address) -> lifetime
+        self._register_ttls = {}
+        
+        # Transactions are executed by a single worker thread fed from a queue
+        self._tx_queue = queue.Queue()
+        self._worker = None
+        self._worker_lock = Lock()
+        
+    @property
+    def _last_operation_time(self) -> float:
+        """Monotonic time of the last operation on this port (shared per port)"""
+        return self._port_state.last_operation_time
+    
+    @_last_operation_time.setter
+    def _last_operation_time(self, value: float) -> None:
+        self._port_state.last_operation_time = value
         
     def connect(self) -> bool:
         """
@@ -108,19 +194,25 @@ class ModbusRTU:
                             parity=parity,
                             stopbits=stopbits,
                             timeout=self.timeout,
-                            write_timeout=self.timeout
+                            write_timeout=self.timeout,
+                            exclusive=True  # flock() the tty so no second process can interleave frames
                         )
-                        
-                        if not self.serial_conn.is_open:
-                            self.serial_conn.open()
                             
                         # Clear buffers after opening
                         self.serial_conn.reset_input_buffer()
                         self.serial_conn.reset_output_buffer()
                         
+                        # Don't let the USB adapter hold back short response frames
+                        set_low_latency(self.serial_conn)
+                        
                         self.device_logger.info(f"Connected to {self.port} at {self.baudrate} baud with parity={parity}, stopbits={stopbits}")
                         return True
                     except Exception as e:
+                        if getattr(e, 'errno', None) in (errno.EAGAIN, errno.EWOULDBLOCK):
+                            # Another process holds the port; other settings will not help
+                            self.device_logger.error(f"Port {self.port} is in use by another process: {e}")
+                            self.serial_conn = None
+                            return False
                         self.device_logger.debug(f"Failed to connect with parity={parity}, stopbits={stopbits}: {e}")
                         if self.serial_conn is not None:
                             try:
@@ -200,7 +292,7 @@ class ModbusRTU:
         self.disconnect()
         return False  # Propagate exceptions
         
-    def send_request(self, request: bytes, unit_id: int, function_code: int, retry_count: int = 2) -> Optional[bytes]:
+    def send_request(self, request: bytes, unit_id: int, function_code: int, retry_count: int = 2) -> Optional[bytearray]:
         """
         Send a Modbus request and wait for response with enhanced robustness for Waveshare devices.
         
@@ -211,12 +303,121 @@ class ModbusRTU:
             retry_count: Number of retries if no response or invalid response (default: 2)
             
         Returns:
-            bytes: Response bytes if successful, None otherwise
+            bytearray: Response frame if successful (owned by the caller), None otherwise
+        """
+        if not self.is_connected():
+            self.device_logger.error("Not connected to device")
+            return None
+        
+        return self._submit(self._execute_request, request, unit_id, function_code, retry_count,
+                            timeout=self._request_deadline(retry_count))
+    
+    async def send_request_async(self, request: bytes, unit_id: int, function_code: int,
+                                 retry_count: int = 2) -> Optional[bytearray]:
+        """
+        Send a Modbus request from asyncio code without blocking the event loop.
+        
+        The RS485 turnaround delay is waited out with asyncio.sleep(), so other
+        coroutines (e.g. ones parsing the previous response or polling other
+        ports) keep running; the transaction itself runs on the worker thread.
+        
+        Args:
+            request: Request bytes to send
+            unit_id: Unit ID (slave address)
+            function_code: Function code of the request
+            retry_count: Number of retries if no response or invalid response (default: 2)
+            
+        Returns:
+            bytearray: Response frame if successful, None otherwise
         """
         if not self.is_connected():
             self.device_logger.error("Not connected to device")
             return None
         
+        delay = self.rs485_ready_time() - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return await asyncio.wrap_future(
+            self._enqueue(self._execute_request, request, unit_id, function_code, retry_count))
+    
+    def rs485_ready_time(self) -> float:
+        """
+        Get the time.monotonic() value from which the next transaction on this
+        port can start without an RS485 turnaround delay.
+        
+        Polling loops can prepare the next request (or parse the last
+        response) until then instead of sleeping inside send_request.
+        """
+        return self._last_operation_time + self.rs485_delay
+    
+    def _request_deadline(self, retry_count: int) -> float:
+        """
+        Upper bound for how long send_request waits on the worker.
+        
+        Covers every attempt at its grown timeout (see _execute_request), the
+        exponential RS485 backoff between retries and the fixed recovery
+        sleeps, plus one second of slack for transactions queued ahead.
+        """
+        attempts = retry_count + 1
+        timeouts = self.timeout * sum(1 + attempt * 0.75 for attempt in range(attempts))
+        backoff = self.rs485_delay * (2 ** attempts) + 0.6 * attempts
+        return timeouts + backoff + 1.0
+    
+    def _submit(self, func, *args, timeout: Optional[float] = None):
+        """
+        Run a serial transaction on the worker thread and wait for its result.
+        
+        Callers only wait on a future instead of contending for the port lock;
+        the worker executes queued transactions one at a time. If the result
+        is not ready within timeout seconds the transaction is reported as
+        failed (None) so a hung worker cannot block callers forever.
+        """
+        if current_thread() is self._worker:
+            return func(*args)
+        future = self._enqueue(func, *args)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            self.device_logger.error(f"Transaction on {self.port} did not complete within {timeout:.2f}s")
+            return None
+    
+    def _enqueue(self, func, *args) -> Future:
+        """Queue a transaction for the worker thread (started on demand)"""
+        future = Future()
+        with self._worker_lock:
+            self._tx_queue.put((func, args, future))
+            if self._worker is None:
+                self._worker = Thread(target=self._run, name=f"modbus-rtu-{self.port}", daemon=True)
+                self._worker.start()
+        return future
+    
+    def _run(self, idle_timeout: float = 5.0) -> None:
+        """
+        Worker loop draining the transaction queue.
+        The thread exits after idle_timeout seconds without work.
+        """
+        while True:
+            try:
+                func, args, future = self._tx_queue.get(timeout=idle_timeout)
+            except queue.Empty:
+                with self._worker_lock:
+                    if self._tx_queue.empty():
+                        self._worker = None
+                        return
+                continue
+            
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+    
+    def _execute_request(self, request: bytes, unit_id: int, function_code: int, retry_count: int) -> Optional[bytearray]:
+        """
+        Execute a request/response cycle with retries (runs on the worker thread).
+        """
         # Enforce minimum delay between operations
         self._enforce_rs485_delay()
         
@@ -232,174 +433,115 @@ class ModbusRTU:
                 self.device_logger.info(f"Retry {attempt}/{retry_count} with timeout {self.timeout:.2f}s")
                 # Add a longer delay between retries with exponential backoff
                 backoff_delay = self.rs485_delay * (2 ** attempt)  # Exponential backoff
-                self.device_logger.debug(f"Applying backoff delay of {backoff_delay:.3f}s before retry")
+                self.device_logger.debug("Applying backoff delay of %.3fs before retry", backoff_delay)
                 time.sleep(backoff_delay)
             
             with self.lock:  # Thread safety for serial operations
                 try:
-                    # Clear any pending data
-                    self.serial_conn.reset_input_buffer()
-                    self.serial_conn.reset_output_buffer()  # Also clear output buffer
+                    # Clear any pending data (skip the flush syscalls when nothing is pending)
+                    if self.strict_flush:
+                        self.serial_conn.reset_input_buffer()
+                        self.serial_conn.reset_output_buffer()  # Also clear output buffer
+                    else:
+                        pending = self.serial_conn.in_waiting
+                        if pending:
+                            # Late answers or bus noise: drain them visibly instead of
+                            # flushing, so misbehaving devices show up in the log
+                            stale = self.serial_conn.read(pending)
+                            self.device_logger.warning(
+                                "Discarding %d stale bytes before request to unit %s: %s",
+                                len(stale), unit_id, stale.hex()
+                            )
+                    
+                    # For Waveshare devices, we need to be more flexible with response formats
+                    # Some devices don't strictly follow the Modbus protocol
+                    expected_min_length = 4  # Minimum valid response (unit_id, function_code, at least 1 data byte, CRC)
+                    
+                    # The response length is known for standard function codes, so block
+                    # on the serial read until the whole frame arrives instead of polling
+                    expected_length = expected_response_length(function_code, request)
+                    if self.serial_conn.timeout != self.timeout:
+                        self.serial_conn.timeout = self.timeout
+                    
+                    # Hex dumps are only built when someone is listening
+                    debug = self.device_logger.isEnabledFor(logging.DEBUG)
                     
                     # Send the request
-                    self.device_logger.debug(f"Sending request to unit {unit_id}, function {function_code}: {request.hex()}")
+                    if debug:
+                        self.device_logger.debug("Sending request to unit %s, function %s: %s",
+                                                 unit_id, function_code, request.hex())
                     bytes_written = self.serial_conn.write(request)
                     self.serial_conn.flush()  # Ensure all data is written
-                    self.device_logger.debug(f"Wrote {bytes_written} bytes to serial port")
+                    self.device_logger.debug("Wrote %s bytes to serial port", bytes_written)
+                    if self.post_write_delay:
+                        time.sleep(self.post_write_delay)
+                    
+                    strict_header = not self._lenient_framing
                     
                     # Wait for response with a timeout
-                    start_time = time.time()
+                    start_time = time.monotonic()
+                    deadline = start_time + self.timeout
                     response = bytearray()
-                    last_read_time = start_time  # Track when we last received data
-                    
-                    # For Waveshare devices, we need to be more flexible with response formats
-                    # Some devices don't strictly follow the Modbus protocol
-                    expected_min_length = 4  # Minimum valid response (unit_id, function_code, at least 1 data byte, CRC)
-                    expected_response_complete = False
                     
                     # Diagnostic information for troubleshooting
                     read_attempts = 0
                     total_bytes_read = 0
                     
-                    # Response collection loop with improved timeout handling
-                    while (time.time() - start_time) < self.timeout:
-                        # Check for data with a small timeout to be responsive
-                        if self.serial_conn.in_waiting > 0:
-                            chunk = self.serial_conn.read(self.serial_conn.in_waiting)
-                            chunk_size = len(chunk)
-                            total_bytes_read += chunk_size
-                            read_attempts += 1
-                            
-                            if chunk_size > 0:
-                                self.device_logger.debug(f"Read chunk ({read_attempts}): {chunk.hex()} ({chunk_size} bytes)")
-                                response.extend(chunk)
-                                last_read_time = time.time()  # Update last read time
-                            
-                            # Log the current response accumulation
-                            self.device_logger.debug(f"Current response buffer: {response.hex()} (length: {len(response)})")
-                            
-                            # Check if we have a complete response
-                            if len(response) >= expected_min_length:  # Minimum response length
-                                # Check if this is an exception response
-                                if len(response) >= 3 and response[1] & 0x80:
-                                    self.device_logger.debug("Detected exception response")
-                                    # Exception response is always 5 bytes
-                                    if len(response) >= 5:
-                                        expected_response_complete = True
-                                        break
-                                    # But for Waveshare, sometimes it's shorter
-                                    elif len(response) >= 3 and (time.time() - start_time) > (self.timeout * 0.6):
-                                        self.device_logger.warning("Short exception response detected - Waveshare quirk")
-                                        expected_response_complete = True
-                                        break
-                                # For normal responses, we need to check the length
-                                elif len(response) >= 3:  # At least unit ID, function code, and length/data
-                                    # Check if the function code matches what we expect
-                                    # Waveshare sometimes returns different function codes
-                                    actual_function_code = response[1]
-                                    if actual_function_code != function_code:
-                                        self.device_logger.warning(
-                                            f"Function code mismatch: expected {function_code}, got {actual_function_code}. "
-                                            f"This is common with Waveshare devices."
-                                        )
-                                    
-                                    # Handle different function codes
-                                    if actual_function_code in [READ_COILS, READ_DISCRETE_INPUTS, 0x41, 
-                                                             READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS, 0x43, 0x44]:
-                                        # For read functions, the response length is in the 3rd byte
-                                        if len(response) >= 3:
-                                            try:
-                                                expected_length = 3 + response[2] + 2  # unit_id + function_code + length + data + CRC
-                                                self.device_logger.debug(f"Expected read response length: {expected_length}")
-                                                if len(response) >= expected_length:
-                                                    expected_response_complete = True
-                                                    break
-                                                # Special case for Waveshare: sometimes byte count is wrong
-                                                # If we've waited most of the timeout and have a reasonable response length
-                                                elif (time.time() - start_time) > (self.timeout * 0.7) and len(response) >= 5:
-                                                    self.device_logger.warning(
-                                                        "Response shorter than expected but accepting it (Waveshare quirk)"
-                                                    )
-                                                    expected_response_complete = True
-                                                    break
-                                            except IndexError:
-                                                self.device_logger.warning("Index error when checking response length")
-                                    elif actual_function_code in [WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER, 0x45, 0x46]:
-                                        # For single write functions, response is normally 8 bytes
-                                        # But for Waveshare, sometimes it's shorter
-                                        expected_length = 8
-                                        self.device_logger.debug(f"Expected write single response length: {expected_length}")
-                                        if len(response) >= expected_length:
-                                            expected_response_complete = True
-                                            break
-                                        # Accept shorter responses after waiting
-                                        elif len(response) >= 4 and (time.time() - start_time) > (self.timeout * 0.6):
-                                            self.device_logger.warning(
-                                                "Short write response detected - Waveshare quirk"
-                                            )
-                                            expected_response_complete = True
-                                            break
-                                    elif actual_function_code in [WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS]:
-                                        # For multiple write functions, response is normally 8 bytes
-                                        expected_length = 8
-                                        self.device_logger.debug(f"Expected write multiple response length: {expected_length}")
-                                        if len(response) >= expected_length:
-                                            expected_response_complete = True
-                                            break
-                                        # Accept shorter responses after waiting
-                                        elif len(response) >= 4 and (time.time() - start_time) > (self.timeout * 0.6):
-                                            self.device_logger.warning(
-                                                "Short write multiple response detected - Waveshare quirk"
-                                            )
-                                            expected_response_complete = True
-                                            break
-                                    else:
-                                        # For other functions, wait for at least 4 bytes
-                                        expected_length = 4
-                                        self.device_logger.debug(f"Expected other response length: {expected_length}")
-                                        if len(response) >= expected_length:
-                                            expected_response_complete = True
-                                            break
-                                            
-                                    # Special case for Waveshare: sometimes they send very short responses
-                                    # If we've waited a bit and still have a partial response, check if it might be valid
-                                    elapsed = time.time() - start_time
-                                    if elapsed > (self.timeout * 0.6) and len(response) >= 3:
-                                        self.device_logger.debug(
-                                            f"Partial response after {elapsed:.2f}s: {response.hex()}. "
-                                            f"Checking if it might be valid."
-                                        )
-                                        # If we have at least unit_id, function_code, and some data
-                                        # Let's consider it potentially complete and try to process it
-                                        if not expected_response_complete:
-                                            self.device_logger.warning(
-                                                "Accepting potentially incomplete response from Waveshare device"
-                                            )
-                                            expected_response_complete = True
-                                            break
-                        
-                        # Check for response timeout - if we haven't received data for a while
-                        # but we have some partial data, we might need to accept it
-                        elapsed_since_last_read = time.time() - last_read_time
-                        if len(response) > 0 and elapsed_since_last_read > (self.timeout * 0.5):
-                            self.device_logger.warning(
-                                f"No new data received for {elapsed_since_last_read:.2f}s but have partial response. "
-                                f"Considering response complete."
-                            )
-                            expected_response_complete = True
+                    # Read the header first: an exception response (function code | 0x80)
+                    # is only 5 bytes long and must not wait for the full frame
+                    wanted = min(3, expected_length or expected_min_length)
+                    header_mismatch = False
+                    while len(response) < wanted and time.monotonic() < deadline:
+                        chunk = self.serial_conn.read(wanted - len(response))
+                        read_attempts += 1
+                        if not chunk:
+                            break  # Serial timeout expired without further data
+                        total_bytes_read += len(chunk)
+                        if debug:
+                            self.device_logger.debug("Read chunk (%d): %s (%d bytes)",
+                                                     read_attempts, chunk.hex(), len(chunk))
+                        response.extend(chunk)
+                        # On strict ports a foreign header means the rest of the frame is not
+                        # ours, so stop instead of waiting for bytes that will never match
+                        if strict_header and len(response) >= 2 and (
+                                (unit_id != 0 and response[0] != unit_id) or
+                                not is_compatible_function_code(response[1] & 0x7F, function_code)):
+                            header_mismatch = True
                             break
-                            
-                        # Short delay to prevent CPU hogging
-                        time.sleep(0.002)  # Reduced from 0.005 to be more responsive
+                        if len(response) >= 2 and response[1] & 0x80:
+                            wanted = EXCEPTION_RESPONSE_SIZE
+                        elif len(response) >= 3:
+                            # The byte count of a read response fixes the frame end
+                            wanted = (response_length_from_header(response)
+                                      or expected_length or expected_min_length)
+                    
+                    if header_mismatch:
+                        self.device_logger.warning(
+                            f"Discarding response with foreign header {response[:2].hex()} for unit {unit_id}, "
+                            f"function {function_code} (attempt {attempt+1}/{retry_count+1})"
+                        )
+                        self.serial_conn.reset_input_buffer()
+                        response = bytearray()
+                        continue
+                    
+                    if expected_length is None:
+                        # Unknown response format, read on until the inter-frame silence
+                        if response:
+                            response.extend(read_until_idle(self.serial_conn, self.baudrate))
+                    elif 1 < len(response) < expected_length and not response[1] & 0x80:
+                        self.device_logger.warning(
+                            f"Response shorter than expected ({len(response)}/{expected_length} bytes), "
+                            f"accepting it (Waveshare quirk)"
+                        )
                     
                     # Update last operation time
-                    self._last_operation_time = time.time()
+                    self._last_operation_time = time.monotonic()
                     
                     # Log diagnostic information
-                    elapsed = time.time() - start_time
+                    elapsed = time.monotonic() - start_time
                     self.device_logger.debug(
-                        f"Response collection complete: {elapsed:.3f}s elapsed, "
-                        f"{read_attempts} read attempts, {total_bytes_read} total bytes read"
+                        "Response collection complete: %.3fs elapsed, %d read attempts, %d total bytes read",
+                        elapsed, read_attempts, total_bytes_read
                     )
                     
                     # Check if we got a response
@@ -418,15 +560,16 @@ class ModbusRTU:
                             
                         continue  # Try again if we have retries left
                     
-                    # Check if the response is complete
-                    if not expected_response_complete and len(response) < expected_min_length:
+                    # Check if the response is complete (short exception responses are a Waveshare quirk)
+                    if len(response) < expected_min_length and not (len(response) >= 3 and response[1] & 0x80):
                         self.device_logger.warning(
                             f"Incomplete response from unit {unit_id}, function {function_code}: {response.hex()} (attempt {attempt+1}/{retry_count+1})"
                         )
                         continue  # Try again if we have retries left
                     
                     # Parse the response
-                    self.device_logger.debug(f"Received response: {response.hex()}")
+                    if debug:
+                        self.device_logger.debug("Received response: %s", response.hex())
                     
                     # Validate response unit ID if it's not a broadcast
                     if len(response) > 0 and unit_id != 0 and response[0] != unit_id:
@@ -461,8 +604,7 @@ class ModbusRTU:
                 except Exception as e:
                     self.device_logger.error(f"Error sending request: {e} (attempt {attempt+1}/{retry_count+1})")
                     # Log traceback for debugging
-                    import traceback
-                    self.device_logger.debug(f"Exception traceback: {traceback.format_exc()}")
+                    self.device_logger.debug("Exception traceback:", exc_info=True)
                     continue  # Try again if we have retries left
         
         # Restore original timeout
@@ -471,8 +613,8 @@ class ModbusRTU:
         # Final diagnostic log
         if response:
             self.device_logger.info(
-                f"Successfully received response from unit {unit_id}, function {function_code}: "
-                f"{len(response)} bytes after {attempt+1} attempt(s)"
+                "Successfully received response from unit %s, function %s: %d bytes after %d attempt(s)",
+                unit_id, function_code, len(response), attempt + 1
             )
         else:
             self.device_logger.error(
@@ -480,8 +622,10 @@ class ModbusRTU:
                 f"after {retry_count+1} attempts"
             )
         
-        # Return the final response (or None if all attempts failed)
-        return bytes(response) if response else None
+        # Return the final response (or None if all attempts failed). The buffer
+        # is fresh for every attempt and never touched again, so hand it over
+        # without copying it into a bytes object
+        return response if response else None
                 
     def _enforce_rs485_delay(self) -> None:
         """
@@ -489,16 +633,17 @@ class ModbusRTU:
         This is necessary to prevent communication errors due to the
         half-duplex nature of RS485.
         """
+        now = time.monotonic()  # Immune to wall-clock adjustments
         if self._last_operation_time > 0:
-            elapsed = time.time() - self._last_operation_time
-            delay_needed = max(0, self.rs485_delay - elapsed)
+            delay_needed = self.rs485_ready_time() - now
             
             if delay_needed > 0:
-                self.device_logger.debug(f"Enforcing RS485 delay of {delay_needed:.3f}s between operations")
+                self.device_logger.debug("Enforcing RS485 delay of %.3fs between operations", delay_needed)
                 time.sleep(delay_needed)
+                now += delay_needed
                 
         # Update last operation time
-        self._last_operation_time = time.time()
+        self._last_operation_time = now
         
     def set_device_baudrate(self, unit_id: int = 0, target_baudrate: int = None) -> bool:
         """
@@ -515,9 +660,6 @@ class ModbusRTU:
         Returns:
             bool: True if successful, False otherwise
         """
-        import json
-        import os
-        
         if not self.is_connected():
             logger.error("Cannot set baudrate: not connected")
             return False
@@ -525,24 +667,11 @@ class ModbusRTU:
         # Use target_baudrate if specified, otherwise use current baudrate
         baudrate = target_baudrate if target_baudrate is not None else self.baudrate
         
-        # Load baudrate mapping from baudrates.json
-        try:
-            with open(os.path.join(CONFIG_DIR, 'baudrates.json'), 'r') as f:
-                baudrate_map = json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to load baudrate mapping: {e}")
-            return False
-            
-        # Convert baudrate to string for dictionary lookup
-        baudrate_str = str(baudrate)
-        
-        # Check if our baudrate is in the mapping
-        if baudrate_str not in baudrate_map:
+        # Get the baudrate code from the mapping in baudrates.json
+        baudrate_code = _baudrate_codes().get(int(baudrate))
+        if baudrate_code is None:
             logger.warning(f"Baudrate {baudrate} not found in mapping, cannot set device baudrate")
             return False
-            
-        # Get the baudrate code from the mapping
-        baudrate_code = baudrate_map[baudrate_str]
         
         try:
             # Build the set baudrate request
@@ -553,22 +682,11 @@ class ModbusRTU:
             self._enforce_rs485_delay()  # Ensure proper timing
             self.serial_conn.write(request)
             
-            # Wait for response with a timeout
-            timeout = self.timeout
-            start_time = time.time()
-            response = bytearray()
-            
-            while (time.time() - start_time) < timeout:
-                if self.serial_conn.in_waiting > 0:
-                    chunk = self.serial_conn.read(self.serial_conn.in_waiting)
-                    response.extend(chunk)
-                    # If we have enough bytes for a response, break
-                    if len(response) >= 8:  # Minimum response length
-                        break
-                time.sleep(0.01)  # Short delay to prevent CPU hogging
+            # Wait for the 8-byte echo of the register write
+            response = read_exact(self.serial_conn, 8, time.monotonic() + self.timeout)
                 
             # Update last operation time
-            self._last_operation_time = time.time()
+            self._last_operation_time = time.monotonic()
             
             # Log the response
             if response:
@@ -673,128 +791,58 @@ class ModbusRTU:
         return False
             
     # High-level API methods for compatibility
+    @_validate_count(2000, 'coil')
     def read_coils(self, unit_id: int, address: int, count: int) -> List[bool]:
         """Read coil states"""
         if not self.is_connected() and not self.connect():
             return []
-            
-        if count < 1 or count > 2000:
-            self.device_logger.error(f"Invalid coil count: {count}")
-            return []
         
         # Log the request details for debugging
-        self.device_logger.info(f"Reading {count} coils from address {address} with unit ID {unit_id}")
-            
-        # Try standard Modbus function code first
-        request = build_read_request(unit_id, READ_COILS, address, count)
-        self.device_logger.debug(f"Request hex: {request.hex()}")
-        response = self.send_request(request, unit_id, READ_COILS)
-        
-        if not response:
-            # If no response, try with Waveshare-specific function code
-            self.device_logger.debug("No response with standard function code, trying Waveshare-specific code")
-            request = build_read_request(unit_id, 0x41, address, count)  # Waveshare sometimes uses 0x41 instead of 0x01
-            self.device_logger.debug(f"Waveshare-specific request hex: {request.hex()}")
-            response = self.send_request(request, unit_id, 0x41)
+        self.device_logger.info("Reading %s coils from address %s with unit ID %s", count, address, unit_id)
             
-        if not response and unit_id != 0:
-            # If still no response and not broadcast, try with unit ID 0 (broadcast)
-            self.device_logger.debug(f"No response with unit ID {unit_id}, trying broadcast address (0)")
-            request = build_read_request(0, READ_COILS, address, count)
-            self.device_logger.debug("Broadcast request hex: " + request.hex())
-            response = self.send_request(request, 0, READ_COILS)
-            
-        if not response:
-            # If still no response, try with unit ID 255 (another common default)
-            self.device_logger.debug("No response with standard addresses, trying unit ID 255")
-            request = build_read_request(255, READ_COILS, address, count)
-            self.device_logger.debug("Unit ID 255 request hex: " + request.hex())
-            response = self.send_request(request, 255, READ_COILS)
+        # Standard function code first, then the Waveshare variant (0x41), the
+        # broadcast address, unit ID 255 (another common default) and finally
+        # READ_DISCRETE_INPUTS
+        response = self._read_with_fallbacks(READ_COILS, unit_id, address, count, [
+            (unit_id, READ_COILS),
+            (unit_id, WAVESHARE_FUNC_READ_COILS),
+            (0, READ_COILS),
+            (255, READ_COILS),
+            (unit_id, READ_DISCRETE_INPUTS),
+        ])
             
         if not response:
-            # Try one more time with a different function code (READ_DISCRETE_INPUTS)
-            self.device_logger.debug(f"No response with READ_COILS, trying READ_DISCRETE_INPUTS with unit ID {unit_id}")
-            request = build_read_request(unit_id, READ_DISCRETE_INPUTS, address, count)
-            self.device_logger.debug("READ_DISCRETE_INPUTS request hex: " + request.hex())
-            response = self.send_request(request, unit_id, READ_DISCRETE_INPUTS)
-            
-        if not response:
-            self.device_logger.warning(f"No response after trying all combinations for reading coils")
+            self.device_logger.warning("No response after trying all combinations for reading coils")
             return []
             
         # For test compatibility
-        if unit_id == 1 and address == 0 and count == 8 and self.port == '/dev/ttyTEST':
+        if unit_id == 1 and address == 0 and count == 8 and self._is_test_port:
             return [True, False, True, False, True, False, True, False]  # 0x55 = 01010101
         
         # Log the response for debugging
-        self.device_logger.debug(f"Response hex: {response.hex()}")
+        if self.device_logger.isEnabledFor(logging.DEBUG):
+            self.device_logger.debug("Response hex: %s", response.hex())
             
-        # Try to parse the response with more tolerance
-        try:
-            # First try standard parsing
-            self.device_logger.debug("Attempting standard response parsing")
-            try:
-                success, result = parse_read_coils_response(response, count)
-                if success and result:
-                    self.device_logger.debug(f"Standard parsing successful: {result}")
-                    return result
-            except Exception as e:
-                self.device_logger.debug(f"Standard parsing failed: {e}")
-                
-            # If parsing failed, try a more lenient approach for Waveshare devices
-            if len(response) >= 3:
-                self.device_logger.debug("Attempting lenient Waveshare parsing")
-                # Try different parsing approaches
-                
-                # Approach 1: Skip unit_id and function_code
-                try:
-                    data = response[2:-2]  # Skip unit_id, function_code, and CRC
-                    if len(data) > 0:
-                        self.device_logger.warning("Using lenient parsing approach 1 for Waveshare response")
-                        # Try to extract coil states from the raw data
-                        coils = []
-                        for byte_val in data:
-                            for bit in range(8):
-                                if len(coils) < count:  # Only extract the requested number of coils
-                                    coils.append(bool((byte_val >> bit) & 1))
-                        if coils:
-                            self.device_logger.debug(f"Lenient parsing approach 1 successful: {coils}")
-                            return coils
-                except Exception as e:
-                    self.device_logger.debug(f"Lenient parsing approach 1 failed: {e}")
-                
-                # Approach 2: Try to extract data regardless of format
-                try:
-                    self.device_logger.warning("Using lenient parsing approach 2 for Waveshare response")
-                    # Just extract bits from all bytes except the last two (CRC)
-                    coils = []
-                    for byte_val in response[:-2]:
-                        for bit in range(8):
-                            if len(coils) < count:  # Only extract the requested number of coils
-                                coils.append(bool((byte_val >> bit) & 1))
-                    if coils:
-                        self.device_logger.debug(f"Lenient parsing approach 2 successful: {coils}")
-                        return coils
-                except Exception as e:
-                    self.device_logger.debug(f"Lenient parsing approach 2 failed: {e}")
-                    
-                # Approach 3: Try to interpret the response as a direct value
-                try:
-                    if len(response) >= 4:  # At least unit_id, function_code, data, CRC
-                        self.device_logger.warning("Using lenient parsing approach 3 for Waveshare response")
-                        # Assume the third byte is the value
-                        value = response[2]
-                        coils = []
-                        for bit in range(8):
-                            if len(coils) < count:  # Only extract the requested number of coils
-                                coils.append(bool((value >> bit) & 1))
-                        if coils:
-                            self.device_logger.debug(f"Lenient parsing approach 3 successful: {coils}")
-                            return coils
-                except Exception as e:
-                    self.device_logger.debug(f"Lenient parsing approach 3 failed: {e}")
-        except Exception as e:
-            self.device_logger.error(f"Error parsing coil response: {e}")
+        # Standard response: unit ID, function code, byte count, coil bytes, CRC
+        if len(response) >= 5 and response[2] == len(response) - 5:
+            coils = unpack_coils(response[3:-2], count)
+            self.device_logger.debug("Standard parsing successful: %s", coils)
+            return coils
+            
+        # Otherwise try more lenient approaches for Waveshare devices
+        if len(response) >= 5:
+            # Approach 1: Skip unit_id and function_code
+            self.device_logger.warning("Using lenient parsing approach 1 for Waveshare response")
+            coils = unpack_coils(response[2:-2], count)  # Skip unit_id, function_code, and CRC
+            self.device_logger.debug("Lenient parsing approach 1 successful: %s", coils)
+            return coils
+            
+        if len(response) >= 3:
+            # Approach 2: Extract bits from all bytes except the last two (CRC)
+            self.device_logger.warning("Using lenient parsing approach 2 for Waveshare response")
+            coils = unpack_coils(response[:-2], count)
+            self.device_logger.debug("Lenient parsing approach 2 successful: %s", coils)
+            return coils
             
         self.device_logger.error("All parsing approaches failed")
         return []
@@ -810,92 +858,287 @@ class ModbusRTU:
         if response is None:
             return None
             
-        return parse_read_coils_response(response)  # Same parsing as coils
+        # Same layout as coils: skip unit, function code and byte count
+        return unpack_coils(response[3:-2], count)
         
+    @_validate_count(125, 'register')
     def read_holding_registers(self, unit_id: int, address: int, count: int) -> List[int]:
         """Read holding register values"""
         if not self.is_connected() and not self.connect():
             return []
-            
-        if count < 1 or count > 125:
-            self.device_logger.error(f"Invalid register count: {count}")
-            return []
         
         # Log the request details for debugging
-        self.device_logger.info(f"Reading {count} holding registers from address {address} with unit ID {unit_id}")
+        self.device_logger.info("Reading %s holding registers from address %s with unit ID %s", count, address, unit_id)
             
-        # Try standard Modbus function code first
-        request = build_read_request(unit_id, READ_HOLDING_REGISTERS, address, count)
-        self.device_logger.debug(f"Request hex: {request.hex()}")
-        response = self.send_request(request, unit_id, READ_HOLDING_REGISTERS)
-        
-        if not response:
-            # If no response, try with Waveshare-specific function code
-            self.device_logger.debug("No response with standard function code, trying Waveshare-specific code")
-            request = build_read_request(unit_id, 0x43, address, count)  # Waveshare sometimes uses 0x43 instead of 0x03
-            self.device_logger.debug("Waveshare-specific request hex: " + request.hex())
-            response = self.send_request(request, unit_id, 0x43)
-            
-        if not response and unit_id != 0:
-            # If still no response and not broadcast, try with unit ID 0 (broadcast)
-            self.device_logger.debug("No response with unit ID " + str(unit_id) + ", trying broadcast address (0)")
-            request = build_read_request(0, READ_HOLDING_REGISTERS, address, count)
-            self.device_logger.debug("Broadcast request hex: " + request.hex())
-            response = self.send_request(request, 0, READ_HOLDING_REGISTERS)
+        # Standard function code first, then the Waveshare variant (0x43) and
+        # the broadcast address
+        response = self._read_with_fallbacks(READ_HOLDING_REGISTERS, unit_id, address, count, [
+            (unit_id, READ_HOLDING_REGISTERS),
+            (unit_id, WAVESHARE_FUNC_READ_HOLDING_REGISTERS),
+            (0, READ_HOLDING_REGISTERS),
+        ])
         
         if not response:
             return []
             
         # For test compatibility
-        if unit_id == 1 and address == 0 and count == 2 and self.port == '/dev/ttyTEST':
+        if unit_id == 1 and address == 0 and count == 2 and self._is_test_port:
             return [0x1234, 0x5678]  # Test values
             
-        success, result = parse_read_registers_response(response, count)
+        # Parse the PDU data (byte count + register data) without header and CRC
+        data = response[2:-2] if len(response) >= 5 else response[2:]
+        success, result = parse_read_registers_response(data, count)
         if not success:
             self.device_logger.warning(f"Failed to parse register response for unit {unit_id}, address {address}")
             
         return result
         
+    def _read_with_fallbacks(self, kind: int, unit_id: int, address: int, count: int,
+                             dialects: List[Tuple[int, int]]) -> Optional[bytes]:
+        """
+        Send a read request in each (unit_id, function_code) dialect until one answers.
+        
+        The dialect that answered is remembered per unit and read kind and
+        tried first next time, so steady-state polling costs one round-trip
+        instead of a timeout for every dialect that does not apply. Attempts
+        after the first are spaced by _fallback_delay.
+        
+        Args:
+            kind: Standard function code identifying the read (cache key)
+            unit_id: Unit ID the caller asked for
+            address: Starting address
+            count: Number of items to read
+            dialects: (unit_id, function_code) pairs in fallback order
+            
+        Returns:
+            bytes: First response received, or None if no dialect answered
+        """
+        ttl = self._range_ttl(unit_id, kind, address, count)
+        if ttl > 0:
+            now = time.monotonic()
+            cache_key = (unit_id, kind, address, count)
+            hit = self._read_cache.get(cache_key)
+            if hit is not None and hit[0] > now:
+                return hit[1]
+        
+        key = (unit_id, kind)
+        preferred = self._dialects.get(key)
+        if preferred is not None:
+            dialects = [preferred] + dialects
+        
+        # Once a unit has stayed silent a few times, stop also probing other
+        # unit IDs (broadcast, 255) on its behalf; only its own dialects are
+        # tried until _UNREACHABLE_TTL has passed since its last failure
+        failures, last_failure = self._unit_failures.get(unit_id, (0, 0.0))
+        if failures >= _UNREACHABLE_AFTER:
+            if time.monotonic() - last_failure < _UNREACHABLE_TTL:
+                dialects = [dialect for dialect in dialects if dialect[0] == unit_id]
+            else:
+                failures = 0
+        
+        # Drop repeats (e.g. the cached dialect, or unit 255 asking for itself)
+        for attempt, (effective_unit, function_code) in enumerate(dict.fromkeys(dialects)):
+            if attempt:
+                time.sleep(self._fallback_delay(attempt, failures))
+            request = build_read_request(effective_unit, function_code, address, count)
+            if self.device_logger.isEnabledFor(logging.DEBUG):
+                self.device_logger.debug("Trying unit %s, function 0x%02X: %s",
+                                         effective_unit, function_code, request.hex())
+            response = self.send_request(request, effective_unit, function_code)
+            if response:
+                self._dialects[key] = (effective_unit, function_code)
+                self._unit_failures.pop(unit_id, None)
+                if ttl > 0:
+                    # Immutable copy: later hits are shared by every caller
+                    self._read_cache[cache_key] = (now + ttl, bytes(response))
+                return response
+        
+        self._dialects.pop(key, None)
+        self._unit_failures[unit_id] = (failures + 1, time.monotonic())
+        return None
+        
+    def _fallback_delay(self, attempt: int, failures: int) -> float:
+        """Capped exponential pause before fallback attempt number attempt (>= 1)"""
+        exponent = min(attempt - 1 + failures, 16)  # Long past the cap; keeps the float finite
+        return min(self._fallback_backoff_base * 2 ** exponent, self._fallback_backoff_cap)
+        
+    def set_read_ttl(self, ttl: float) -> None:
+        """
+        Serve repeated coil and register reads from memory for ttl seconds.
+        
+        A read of the same unit, function, address and count within the TTL
+        returns the previous response without touching the bus. Writes through
+        this instance drop the cached reads of the unit they wrote to.
+        
+        Args:
+            ttl: Lifetime of a cached read in seconds (0 disables caching)
+        """
+        self._read_ttl = ttl
+        if ttl <= 0 and not self._register_ttls:
+            self._read_cache.clear()
+        
+    def set_register_ttl(self, address: int, ttl: float, kind: int = READ_HOLDING_REGISTERS,
+                         unit_id: Optional[int] = None) -> None:
+        """
+        Override the read cache lifetime for one address.
+        
+        A read spanning several addresses is cached for the shortest lifetime
+        among them, so a fast-changing register keeps its whole range fresh.
+        
+        Args:
+            address: Coil or register address
+            ttl: Lifetime in seconds (0 never caches reads including it)
+            kind: Read function the address belongs to (READ_COILS,
+                READ_HOLDING_REGISTERS or READ_INPUT_REGISTERS)
+            unit_id: Unit the override applies to (default: every unit)
+        """
+        self._register_ttls[(unit_id, kind, address)] = ttl
+        
+    def _range_ttl(self, unit_id: int, kind: int, address: int, count: int) -> float:
+        """Cache lifetime of a read of count items of one kind starting at address"""
+        if not self._register_ttls:
+            return self._read_ttl
+        overrides = {}
+        for (ttl_unit, ttl_kind, ttl_address), ttl in self._register_ttls.items():
+            if ttl_kind != kind or not address <= ttl_address < address + count:
+                continue
+            # A unit-specific override wins over one set for every unit
+            if ttl_unit == unit_id or (ttl_unit is None and ttl_address not in overrides):
+                overrides[ttl_address] = ttl
+        if not overrides:
+            return self._read_ttl
+        lifetimes = list(overrides.values())
+        if len(overrides) < count:
+            lifetimes.append(self._read_ttl)  # Addresses without an override
+        return min(lifetimes)
+        
+    def _invalidate_reads(self, unit_id: int, kind: int) -> None:
+        """Drop cached reads of one unit and read kind after a write (every unit for a broadcast)"""
+        if self._read_cache:
+            self._read_cache = {key: entry for key, entry in self._read_cache.items()
+                                if key[1] != kind or (unit_id != 0 and key[0] != unit_id)}
+        
+    def read_coils_multi(self, unit_id: int, requests: List[Tuple[int, int]],
+                         max_gap: int = 16) -> List[List[bool]]:
+        """
+        Read several coil ranges with as few requests as possible.
+        
+        See read_holding_registers_multi for how ranges are merged; coil
+        windows hold up to 2000 coils, and a gap of 16 coils costs only two
+        extra bytes in the response.
+        
+        Args:
+            unit_id: Unit ID
+            requests: List of (address, count) tuples
+            max_gap: Maximum number of unrequested coils read to join ranges
+            
+        Returns:
+            List[List[bool]]: Coil states per request, in request order
+            (empty list for ranges that could not be read)
+        """
+        return self._read_coalesced(lambda start, count: self.read_coils(unit_id, start, count),
+                                    requests, max_gap, max_count=2000)
+        
+    def read_holding_registers_multi(self, unit_id: int, requests: List[Tuple[int, int]],
+                                     max_gap: int = 8) -> List[List[int]]:
+        """
+        Read several holding register ranges with as few requests as possible.
+        
+        Overlapping and nearby ranges are merged into one read of at most 125
+        registers. Up to max_gap unrequested registers between two ranges are
+        read and discarded, which is cheaper than another serial round-trip.
+        Use max_gap=0 for devices where reading unmapped registers fails.
+        
+        Args:
+            unit_id: Unit ID
+            requests: List of (address, count) tuples
+            max_gap: Maximum number of unrequested registers read to join ranges
+            
+        Returns:
+            List[List[int]]: Register values per request, in request order
+            (empty list for ranges that could not be read)
+        """
+        return self._read_coalesced(lambda start, count: self.read_holding_registers(unit_id, start, count),
+                                    requests, max_gap)
+        
+    def read_holding_registers_batched(self, unit_id: int, addresses: List[int],
+                                       max_gap: int = 4) -> List[Optional[int]]:
+        """
+        Single-register form of read_holding_registers_multi.
+        
+        Args:
+            unit_id: Unit ID
+            addresses: Register addresses, in any order
+            max_gap: Maximum number of unrequested registers read to join addresses
+            
+        Returns:
+            List[Optional[int]]: Value per address, in address list order
+            (None for registers that could not be read)
+        """
+        return [values[0] if values else None for values in
+                self.read_holding_registers_multi(unit_id, [(address, 1) for address in addresses], max_gap)]
+        
+    def _read_coalesced(self, read, requests: List[Tuple[int, int]], max_gap: int,
+                        max_count: int = 125) -> List[list]:
+        """
+        Issue one read(start, count) per coalesced window and slice the values
+        back into the requested ranges (empty list where a window failed).
+        """
+        results = [[] for _ in requests]
+        for start, count, indexes in coalesce_ranges(requests, max_gap, max_count):
+            values = read(start, count) or []
+            for index in indexes:
+                address, length = requests[index]
+                results[index] = values[address - start:address - start + length]
+        return results
+        
+    @_validate_count(125, 'register')
     def read_input_registers(self, unit_id: int, address: int, count: int) -> List[int]:
         """Read input register values"""
         if not self.is_connected() and not self.connect():
             return []
-            
-        if count < 1 or count > 125:
-            self.device_logger.error(f"Invalid register count: {count}")
-            return []
         
         # Log the request details for debugging
-        self.device_logger.info(f"Reading {count} input registers from address {address} with unit ID {unit_id}")
-            
-        # Try standard Modbus function code first
-        request = build_read_request(unit_id, READ_INPUT_REGISTERS, address, count)
-        self.device_logger.debug(f"Request hex: {request.hex()}")
-        response = self.send_request(request, unit_id, READ_INPUT_REGISTERS)
-        
-        if not response:
-            # If no response, try with Waveshare-specific function code
-            self.device_logger.debug("No response with standard function code, trying Waveshare-specific code")
-            request = build_read_request(unit_id, 0x44, address, count)  # Waveshare sometimes uses 0x44 instead of 0x04
-            self.device_logger.debug("Waveshare-specific request hex: " + request.hex())
-            response = self.send_request(request, unit_id, 0x44)
+        self.device_logger.info("Reading %s input registers from address %s with unit ID %s", count, address, unit_id)
             
-        if not response and unit_id != 0:
-            # If still no response and not broadcast, try with unit ID 0 (broadcast)
-            self.device_logger.debug(f"No response with unit ID {unit_id}, trying broadcast address (0)")
-            request = build_read_request(0, READ_INPUT_REGISTERS, address, count)
-            self.device_logger.debug("Broadcast request hex: " + request.hex())
-            response = self.send_request(request, 0, READ_INPUT_REGISTERS)
+        # Standard function code first, then the Waveshare variant (0x44) and
+        # the broadcast address
+        response = self._read_with_fallbacks(READ_INPUT_REGISTERS, unit_id, address, count, [
+            (unit_id, READ_INPUT_REGISTERS),
+            (unit_id, WAVESHARE_FUNC_READ_INPUT_REGISTERS),
+            (0, READ_INPUT_REGISTERS),
+        ])
         
         if not response:
             return []
             
-        success, result = parse_read_registers_response(response, count)
+        # Parse the PDU data (byte count + register data) without header and CRC
+        data = response[2:-2] if len(response) >= 5 else response[2:]
+        success, result = parse_read_registers_response(data, count)
         if not success:
             self.device_logger.warning(f"Failed to parse input register response for unit {unit_id}, address {address}")
             
         return result
         
+    def read_input_registers_multi(self, unit_id: int, requests: List[Tuple[int, int]],
+                                   max_gap: int = 8) -> List[List[int]]:
+        """
+        Read several input register ranges with as few requests as possible.
+        
+        See read_holding_registers_multi for how ranges are merged.
+        
+        Args:
+            unit_id: Unit ID
+            requests: List of (address, count) tuples
+            max_gap: Maximum number of unrequested registers read to join ranges
+            
+        Returns:
+            List[List[int]]: Register values per request, in request order
+            (empty list for ranges that could not be read)
+        """
+        return self._read_coalesced(lambda start, count: self.read_input_registers(unit_id, start, count),
+                                    requests, max_gap)
+        
     def write_single_coil(self, unit_id: int, address: int, value: bool) -> bool:
         """Write single coil state"""
         if not self.is_connected() and not self.connect():
@@ -903,6 +1146,7 @@ class ModbusRTU:
             
         request = build_write_single_coil_request(unit_id, address, value)
         response = self.send_request(request, unit_id, WRITE_SINGLE_COIL)
+        self._invalidate_reads(unit_id, READ_COILS)
         
         return response is not None
         
@@ -913,6 +1157,7 @@ class ModbusRTU:
             
         request = build_write_single_register_request(unit_id, address, value)
         response = self.send_request(request, unit_id, WRITE_SINGLE_REGISTER)
+        self._invalidate_reads(unit_id, READ_HOLDING_REGISTERS)
         
         return response is not None
         
@@ -923,6 +1168,7 @@ class ModbusRTU:
             
         request = build_write_multiple_coils_request(unit_id, address, values)
         response = self.send_request(request, unit_id, WRITE_MULTIPLE_COILS)
+        self._invalidate_reads(unit_id, READ_COILS)
         
         return response is not None
         
@@ -933,6 +1179,7 @@ class ModbusRTU:
             
         request = build_write_multiple_registers_request(unit_id, address, values)
         response = self.send_request(request, unit_id, WRITE_MULTIPLE_REGISTERS)
+        self._invalidate_reads(unit_id, READ_HOLDING_REGISTERS)
         
         return response is not None
         
@@ -942,7 +1189,6 @@ class ModbusRTU:
         
     def _build_request(self, unit_id: int, function_code: int, data: bytes = None) -> bytes:
         """Build a Modbus request (compatibility method)"""
-        from .protocol import build_request
         return build_request(unit_id, function_code, data)
         
     def _parse_response(self, response: bytes, unit_id: int = None, function_code: int = None, check_crc: bool = True) -> Union[bytes, None]:
@@ -958,123 +1204,172 @@ class ModbusRTU:
             bytes: Response data if valid, None otherwise
         """
         # Log the raw response for debugging
-        self.device_logger.debug(f"Parsing response: {response.hex() if response else 'None'} (length: {len(response) if response else 0})")
+        if self.device_logger.isEnabledFor(logging.DEBUG):
+            self.device_logger.debug("Parsing response: %s (length: %d)",
+                                     response.hex() if response else 'None', len(response) if response else 0)
         
-        # For backward compatibility with tests
+        # Callers that know the expected unit and function get the checked parser,
+        # everything else the tolerant generic one
         if unit_id is not None and function_code is not None:
-            # Legacy format expected by tests
-            if not response or len(response) < 4:  # Too short for a valid response
-                self.device_logger.warning(f"Response too short for parsing: {response.hex() if response else 'None'}")
-                # For test compatibility, special case for test port
-                if self.port == '/dev/ttyTEST':
-                    self.device_logger.debug("Test port detected, returning mock data")
-                    # Return mock data for tests
-                    if function_code == READ_COILS:
-                        return bytes([0x01])  # 1 byte with value 0x01
-                    elif function_code == READ_HOLDING_REGISTERS:
-                        return bytes([0x00, 0x01])  # 2 bytes with value 0x0001
-                    else:
-                        return bytes([0x00])  # Default mock data
+            return self._parse_expected_response(response, unit_id, function_code, check_crc)
+        return self._parse_generic_response(response, function_code)
+        
+    def _parse_expected_response(self, response: bytes, unit_id: int, function_code: int,
+                                 check_crc: bool) -> Optional[bytes]:
+        """Check a response against the expected unit ID and function code and return its data"""
+        if not response or len(response) < 4:  # Too short for a valid response
+            self.device_logger.warning(f"Response too short for parsing: {response.hex() if response else 'None'}")
+            # For test compatibility, special case for test port
+            if self._is_test_port:
+                self.device_logger.debug("Test port detected, returning mock data")
+                # Return mock data for tests
+                if function_code == READ_COILS:
+                    return bytes([0x01])  # 1 byte with value 0x01
+                elif function_code == READ_HOLDING_REGISTERS:
+                    return bytes([0x00, 0x01])  # 2 bytes with value 0x0001
+                else:
+                    return bytes([0x00])  # Default mock data
+            return None
+        
+        # Healthy bus: expected header and a valid CRC skip the tolerant checks below
+        if (len(response) >= 5 and response[0] == unit_id and response[1] == function_code and
+                (not check_crc or crc.validate_crc(response)[0])):
+            return response[2:-2]
+            
+        # Check unit ID and function code with more tolerance for Waveshare devices
+        if response[0] != unit_id:
+            self.device_logger.warning(f"Unit ID mismatch: expected {unit_id}, got {response[0]}")
+            # For Waveshare, we'll continue anyway as some devices don't respect unit ID
+            # But for strict test compatibility, we need to enforce this
+            if not self._lenient_framing:
                 return None
-                
-            # Check unit ID and function code with more tolerance for Waveshare devices
-            if response[0] != unit_id:
-                self.device_logger.warning(f"Unit ID mismatch: expected {unit_id}, got {response[0]}")
-                # For Waveshare, we'll continue anyway as some devices don't respect unit ID
-                # But for strict test compatibility, we need to enforce this
-                if self.port != '/dev/ttyTEST' and not self.port.startswith('/dev/ttyACM'):
-                    return None
-                
-            # Check for exception response
-            if response[1] & 0x80:
-                exception_code = response[2] if len(response) > 2 else 'unknown'
-                self.device_logger.error(f"Modbus exception: function {function_code}, code {exception_code}")
+            
+        # Exception responses end here: no function code check, and the CRC
+        # covers only the 3-byte exception frame
+        if response[1] & 0x80:
+            if (len(response) >= EXCEPTION_RESPONSE_SIZE and
+                    not crc.validate_crc(memoryview(response)[:EXCEPTION_RESPONSE_SIZE])[0]):
+                self.device_logger.warning("Discarding corrupted exception response: %s", response.hex())
                 return None
-                
-            # Check function code with tolerance for Waveshare devices
-            if response[1] != function_code:
-                self.device_logger.warning(
-                    f"Function code mismatch: expected {function_code}, got {response[1]}"
-                )
-                # Special case for Waveshare: sometimes they return 0x41 instead of 0x01
-                if not (response[1] == 0x41 and function_code == READ_COILS):
-                    # For strict test compatibility, we need to enforce this
-                    if self.port != '/dev/ttyTEST' and not self.port.startswith('/dev/ttyACM'):
-                        return None
-                
-            # Check CRC if requested with tolerance for Waveshare devices
-            if check_crc and len(response) >= 4:  # Need at least 4 bytes for CRC check
-                try:
-                    received_crc = struct.unpack('<H', response[-2:])[0]
-                    calculated_crc = self._calculate_crc(response[:-2])
-                    if received_crc != calculated_crc:
-                        self.device_logger.warning(
-                            f"CRC mismatch: received {received_crc:04x}, calculated {calculated_crc:04x}"
-                        )
-                        # For Waveshare, we'll continue anyway as some devices have CRC issues
-                        # But for strict test compatibility, we need to enforce this
-                        if self.port != '/dev/ttyTEST' and not self.port.startswith('/dev/ttyACM'):
-                            return None
-                except Exception as e:
-                    self.device_logger.error(f"Error checking CRC: {e}")
-                    # Continue despite CRC check error for Waveshare devices
-                    if self.port != '/dev/ttyTEST' and not self.port.startswith('/dev/ttyACM'):
+            exception_code = response[2]
+            self.device_logger.error("Modbus exception: function %s, code %s (%s)", function_code,
+                                     exception_code, EXCEPTION_DESCRIPTIONS.get(exception_code, 'unknown'))
+            return None
+            
+        # Check function code with tolerance for Waveshare devices
+        if response[1] != function_code:
+            self.device_logger.warning(
+                f"Function code mismatch: expected {function_code}, got {response[1]}"
+            )
+            # Waveshare variants (e.g. 0x41 for READ_COILS) are always accepted;
+            # other mismatches only on lenient ports
+            aliases = FUNCTION_CODE_ALIASES.get(function_code)
+            if (aliases is None or response[1] not in aliases) and not self._lenient_framing:
+                return None
+            
+        # Check CRC if requested with tolerance for Waveshare devices
+        if check_crc and len(response) >= 4:  # Need at least 4 bytes for CRC check
+            try:
+                received_crc = response[-2] | (response[-1] << 8)  # Low byte first
+                calculated_crc = self._calculate_crc(memoryview(response)[:-2])
+                if received_crc != calculated_crc:
+                    self.device_logger.warning(
+                        f"CRC mismatch: received {received_crc:04x}, calculated {calculated_crc:04x}"
+                    )
+                    # For Waveshare, we'll continue anyway as some devices have CRC issues
+                    # But for strict test compatibility, we need to enforce this
+                    if not self._lenient_framing:
                         return None
-                    
-            # Return data portion (without unit ID, function code, and CRC)
-            # For very short responses, be more careful
-            if len(response) <= 4:
-                self.device_logger.warning(f"Response too short for standard parsing: {response.hex()}")
-                # For Waveshare, try to extract what we can
-                if len(response) == 4:  # unit_id + function_code + 1 data byte + partial CRC
-                    self.device_logger.debug("Extracting single data byte from short response")
-                    return bytes([response[2]])
-                elif len(response) == 3:  # unit_id + function_code + 1 data byte
-                    self.device_logger.debug("Extracting single data byte from very short response")
-                    return bytes([response[2]])
-                else:
+            except Exception as e:
+                self.device_logger.error(f"Error checking CRC: {e}")
+                # Continue despite CRC check error for Waveshare devices
+                if not self._lenient_framing:
                     return None
+                
+        # Return data portion (without unit ID, function code, and CRC)
+        # For very short responses, be more careful
+        if len(response) <= 4:
+            self.device_logger.warning(f"Response too short for standard parsing: {response.hex()}")
+            # For Waveshare, try to extract what we can
+            if len(response) == 4:  # unit_id + function_code + 1 data byte + partial CRC
+                self.device_logger.debug("Extracting single data byte from short response")
+                return bytes([response[2]])
+            elif len(response) == 3:  # unit_id + function_code + 1 data byte
+                self.device_logger.debug("Extracting single data byte from very short response")
+                return bytes([response[2]])
             else:
-                # Normal case - return data portion
-                data = response[2:-2]
-                self.device_logger.debug(f"Extracted data: {data.hex()} (length: {len(data)})")
-                return data
+                return None
         else:
-            # Use the new implementation with more tolerance for Waveshare devices
-            try:
-                success, result = parse_response(response, function_code)
-                if success:
-                    return result.get('data')
-                else:
-                    self.device_logger.warning(f"Standard parsing failed: {result.get('error', 'Unknown error')}")
-                    
-                    # For Waveshare devices, try a more lenient approach
-                    if response and len(response) >= 3:
-                        self.device_logger.debug("Attempting lenient Waveshare parsing")
-                        # Try to extract data portion directly
-                        if len(response) >= 5:  # unit_id + function_code + data + CRC
-                            data = response[2:-2]
-                        else:  # Very short response
-                            data = response[2:]
-                            
-                        self.device_logger.debug(f"Lenient parsing extracted: {data.hex() if data else 'None'}")
-                        return data
-                    return None
-            except Exception as error:
-                self.device_logger.error(f"Error in parse_response: {error}")
-                # As a last resort for Waveshare devices
+            # Normal case - return data portion
+            data = response[2:-2]
+            if self.device_logger.isEnabledFor(logging.DEBUG):
+                self.device_logger.debug("Extracted data: %s (length: %d)", data.hex(), len(data))
+            return data
+        
+    def _parse_generic_response(self, response: bytes, function_code: Optional[int]) -> Optional[bytes]:
+        """Parse a response with protocol.parse_response, falling back to lenient Waveshare slicing"""
+        try:
+            success, result = parse_response(response, function_code)
+            if success:
+                return result.get('data')
+            else:
+                self.device_logger.warning(f"Standard parsing failed: {result.get('error', 'Unknown error')}")
+                
+                # For Waveshare devices, try a more lenient approach
                 if response and len(response) >= 3:
-                    return response[2:-2] if len(response) >= 5 else response[2:]
+                    self.device_logger.debug("Attempting lenient Waveshare parsing")
+                    # Try to extract data portion directly
+                    if len(response) >= 5:  # unit_id + function_code + data + CRC
+                        data = response[2:-2]
+                    else:  # Very short response
+                        data = response[2:]
+                        
+                    if self.device_logger.isEnabledFor(logging.DEBUG):
+                        self.device_logger.debug("Lenient parsing extracted: %s", data.hex() if data else 'None')
+                    return data
                 return None
+        except Exception as error:
+            self.device_logger.error(f"Error in parse_response: {error}")
+            # As a last resort for Waveshare devices
+            if response and len(response) >= 3:
+                return response[2:-2] if len(response) >= 5 else response[2:]
+            return None
         
     def _port_exists(self, port: str) -> bool:
         """Check if a serial port exists (compatibility method)"""
-        try:
-            s = serial.Serial(port)
-            s.close()
+        return _port_exists(port)
+
+
+@lru_cache(maxsize=1)
+def _baudrate_codes() -> Dict[int, int]:
+    """Waveshare baudrate codes from baudrates.json, keyed by baudrate (parsed once)"""
+    try:
+        return {int(baudrate): code for baudrate, code in get_baudrates().items()}
+    except (TypeError, ValueError) as e:
+        logger.error(f"Invalid baudrate mapping: {e}")
+        return {}
+
+
+@lru_cache(maxsize=64)
+def _port_exists(port: str) -> bool:
+    """
+    Check if a serial port exists by opening it.
+    Results are cached; call invalidate_port_cache() after hot-plugging devices.
+    """
+    try:
+        s = serial.Serial(port)
+        s.close()
+        return True
+    except Exception:
+        # For test compatibility, always return True for test ports
+        if port == '/dev/ttyTEST':
             return True
-        except Exception as e:
-            # For test compatibility, always return True for test ports
-            if port == '/dev/ttyTEST':
-                return True
-            return False
+        # A port that no longer opens hints at a plug change
+        invalidate_serial_ports_cache()
+        return False
+
+
+def invalidate_port_cache() -> None:
+    """Forget cached port existence checks and the port list (e.g. after plugging in a device)"""
+    _port_exists.cache_clear()
+    invalidate_serial_ports_cache()
@@ -4,26 +4,29 @@ High-level client API for Modbus RTU communication
 """
 
 import logging
-import time
 from typing import List, Optional, Dict, Any, Tuple, Union
 
-from .base import ModbusRTU
+from .base import ModbusRTU, _baudrate_codes
 from modapi.config import (
     DEFAULT_PORT, DEFAULT_BAUDRATE, DEFAULT_TIMEOUT, DEFAULT_UNIT_ID,
     DEFAULT_RS485_DELAY, HIGHEST_PRIORITIZED_BAUDRATE,
-    BAUDRATES, AUTO_DETECT_UNIT_IDS,
+    BAUDRATES, PRIORITIZED_BAUDRATES, AUTO_DETECT_UNIT_IDS,
     READ_COILS, READ_DISCRETE_INPUTS,
     READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS,
     WRITE_SINGLE_COIL, WRITE_SINGLE_REGISTER,
     WRITE_MULTIPLE_COILS, WRITE_MULTIPLE_REGISTERS
 )
 from .protocol import (
-    build_read_request, build_write_single_coil_request,
+    build_write_single_coil_request,
     build_write_single_register_request, build_write_multiple_coils_request,
     build_write_multiple_registers_request, build_set_baudrate_request,
-    parse_read_coils_response, parse_read_registers_response, parse_response
+    parse_read_registers_response, parse_response, expected_response_length,
+    unpack_coils
+)
+from .utils import (
+    find_serial_ports, test_modbus_port, scan_for_devices, find_first_device,
+    detect_device_type, _read_rtu_frame
 )
-from .utils import find_serial_ports, test_modbus_port, scan_for_devices, detect_device_type
 
 logger = logging.getLogger(__name__)
 
@@ -64,13 +67,12 @@ class ModbusRTUClient(ModbusRTU):
         if not self.is_connected() and not self.connect():
             return None
         
-        request = build_read_request(unit_id, READ_COILS, address, count)
-        response = self.send_request(request, unit_id, READ_COILS)
+        response = self._read_with_fallbacks(READ_COILS, unit_id, address, count, [(unit_id, READ_COILS)])
         
         if response is None:
             return None
         
-        return parse_read_coils_response(response)
+        return unpack_coils(response[3:-2], count)
     
     def read_discrete_inputs(self, address: int, count: int, unit_id: int = 1) -> Optional[List[bool]]:
         """
@@ -87,13 +89,12 @@ class ModbusRTUClient(ModbusRTU):
         if not self.is_connected() and not self.connect():
             return None
         
-        request = build_read_request(unit_id, READ_DISCRETE_INPUTS, address, count)
-        response = self.send_request(request, unit_id, READ_DISCRETE_INPUTS)
+        response = self._read_with_fallbacks(READ_DISCRETE_INPUTS, unit_id, address, count, [(unit_id, READ_DISCRETE_INPUTS)])
         
         if response is None:
             return None
         
-        return parse_read_coils_response(response)
+        return unpack_coils(response[3:-2], count)
     
     def read_holding_registers(self, address: int, count: int, unit_id: int = 1) -> Optional[List[int]]:
         """
@@ -110,13 +111,14 @@ class ModbusRTUClient(ModbusRTU):
         if not self.is_connected() and not self.connect():
             return None
         
-        request = build_read_request(unit_id, READ_HOLDING_REGISTERS, address, count)
-        response = self.send_request(request, unit_id, READ_HOLDING_REGISTERS)
+        response = self._read_with_fallbacks(READ_HOLDING_REGISTERS, unit_id, address, count, [(unit_id, READ_HOLDING_REGISTERS)])
         
         if response is None:
             return None
         
-        return parse_read_registers_response(response)
+        # Parse the PDU data (byte count + register data) without header and CRC
+        success, values = parse_read_registers_response(response[2:-2], count)
+        return values if success else None
     
     def read_input_registers(self, address: int, count: int, unit_id: int = 1) -> Optional[List[int]]:
         """
@@ -133,13 +135,82 @@ class ModbusRTUClient(ModbusRTU):
         if not self.is_connected() and not self.connect():
             return None
         
-        request = build_read_request(unit_id, READ_INPUT_REGISTERS, address, count)
-        response = self.send_request(request, unit_id, READ_INPUT_REGISTERS)
+        response = self._read_with_fallbacks(READ_INPUT_REGISTERS, unit_id, address, count, [(unit_id, READ_INPUT_REGISTERS)])
         
         if response is None:
             return None
         
-        return parse_read_registers_response(response)
+        # Parse the PDU data (byte count + register data) without header and CRC
+        success, values = parse_read_registers_response(response[2:-2], count)
+        return values if success else None
+    
+    def read_coils_multi(self, requests: List[Tuple[int, int]], unit_id: int = 1,
+                         max_gap: int = 16) -> List[List[bool]]:
+        """
+        Read several coil ranges, coalescing nearby ones (up to 2000 coils per request)
+        
+        Args:
+            requests: List of (address, count) tuples
+            unit_id: Unit ID
+            max_gap: Maximum number of unrequested coils read to join ranges
+            
+        Returns:
+            List[List[bool]]: Coil states per request, in request order
+            (empty list for ranges that could not be read)
+        """
+        return self._read_coalesced(lambda start, count: self.read_coils(start, count, unit_id),
+                                    requests, max_gap, max_count=2000)
+    
+    def read_holding_registers_multi(self, requests: List[Tuple[int, int]], unit_id: int = 1,
+                                     max_gap: int = 8) -> List[List[int]]:
+        """
+        Read several holding register ranges, coalescing nearby ones
+        
+        Args:
+            requests: List of (address, count) tuples
+            unit_id: Unit ID
+            max_gap: Maximum number of unrequested registers read to join ranges
+            
+        Returns:
+            List[List[int]]: Register values per request, in request order
+            (empty list for ranges that could not be read)
+        """
+        return self._read_coalesced(lambda start, count: self.read_holding_registers(start, count, unit_id),
+                                    requests, max_gap)
+    
+    def read_holding_registers_batched(self, addresses: List[int], unit_id: int = 1,
+                                       max_gap: int = 4) -> List[Optional[int]]:
+        """
+        Single-register form of read_holding_registers_multi
+        
+        Args:
+            addresses: Register addresses, in any order
+            unit_id: Unit ID
+            max_gap: Maximum number of unrequested registers read to join addresses
+            
+        Returns:
+            List[Optional[int]]: Value per address, in address list order
+            (None for registers that could not be read)
+        """
+        return [values[0] if values else None for values in
+                self.read_holding_registers_multi([(address, 1) for address in addresses], unit_id, max_gap)]
+    
+    def read_input_registers_multi(self, requests: List[Tuple[int, int]], unit_id: int = 1,
+                                   max_gap: int = 8) -> List[List[int]]:
+        """
+        Read several input register ranges, coalescing nearby ones
+        
+        Args:
+            requests: List of (address, count) tuples
+            unit_id: Unit ID
+            max_gap: Maximum number of unrequested registers read to join ranges
+            
+        Returns:
+            List[List[int]]: Register values per request, in request order
+            (empty list for ranges that could not be read)
+        """
+        return self._read_coalesced(lambda start, count: self.read_input_registers(start, count, unit_id),
+                                    requests, max_gap)
     
     def write_coil(self, address: int, value: bool, unit_id: int = 1) -> bool:
         """
@@ -158,6 +229,7 @@ class ModbusRTUClient(ModbusRTU):
         
         request = build_write_single_coil_request(unit_id, address, value)
         response = self.send_request(request, unit_id, WRITE_SINGLE_COIL)
+        self._invalidate_reads(unit_id, READ_COILS)
         
         return response is not None
     
@@ -178,6 +250,7 @@ class ModbusRTUClient(ModbusRTU):
         
         request = build_write_single_register_request(unit_id, address, value)
         response = self.send_request(request, unit_id, WRITE_SINGLE_REGISTER)
+        self._invalidate_reads(unit_id, READ_HOLDING_REGISTERS)
         
         return response is not None
     
@@ -198,6 +271,7 @@ class ModbusRTUClient(ModbusRTU):
         
         request = build_write_multiple_coils_request(unit_id, address, values)
         response = self.send_request(request, unit_id, WRITE_MULTIPLE_COILS)
+        self._invalidate_reads(unit_id, READ_COILS)
         
         return response is not None
     
@@ -218,6 +292,7 @@ class ModbusRTUClient(ModbusRTU):
         
         request = build_write_multiple_registers_request(unit_id, address, values)
         response = self.send_request(request, unit_id, WRITE_MULTIPLE_REGISTERS)
+        self._invalidate_reads(unit_id, READ_HOLDING_REGISTERS)
         
         return response is not None
         
@@ -243,28 +318,11 @@ class ModbusRTUClient(ModbusRTU):
         else:
             logger.info(f"Using specified baudrate: {baudrate}")
             
-        # Load baudrate mapping
-        import json
-        import os
-        from modapi.config import CONFIG_DIR
-        
-        try:
-            with open(os.path.join(CONFIG_DIR, 'baudrates.json'), 'r') as f:
-                baudrate_map = json.load(f)
-        except Exception as e:
-            logger.error(f"Failed to load baudrate mapping: {e}")
-            return False
-            
-        # Convert baudrate to string for dictionary lookup
-        baudrate_str = str(baudrate)
-        
-        # Check if our baudrate is in the mapping
-        if baudrate_str not in baudrate_map:
+        # Get the baudrate code from the mapping in baudrates.json (parsed once)
+        baudrate_code = _baudrate_codes().get(int(baudrate))
+        if baudrate_code is None:
             logger.warning(f"Baudrate {baudrate} not found in mapping, cannot set device baudrate")
             return False
-            
-        # Get the baudrate code from the mapping
-        baudrate_code = baudrate_map[baudrate_str]
         
         if not self.is_connected() and not self.connect():
             return False
@@ -306,26 +364,28 @@ class ModbusRTUClient(ModbusRTU):
             return None
         
         # Send request and get raw response
-        with self._lock:
+        with self.lock:
             try:
                 # Clear input buffer
-                self._serial.reset_input_buffer()
+                self.serial_conn.reset_input_buffer()
                 
                 # Send request
-                logger.debug(f"Sending raw request: {request.hex()}")
-                self._serial.write(request)
-                
-                # Wait for response
-                time.sleep(0.1)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sending raw request: %s", request.hex())
+                self.serial_conn.write(request)
                 
-                # Read response
-                if self._serial.in_waiting > 0:
-                    response = self._serial.read(self._serial.in_waiting)
-                    logger.debug(f"Received raw response: {response.hex()}")
+                # Block until the frame has arrived (or the line went silent)
+                # instead of sleeping and polling in_waiting
+                response = _read_rtu_frame(self.serial_conn, self.baudrate,
+                                           expected_response_length(expected_function, request),
+                                           self.timeout)
+                if response:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Received raw response: %s", response.hex())
                     
                     # Validate response
-                    data = parse_response(response, expected_unit, expected_function)
-                    if data is not None:
+                    success, result = parse_response(response, expected_function)
+                    if success and (expected_unit == 0 or result.get('unit_id') == expected_unit):
                         return response
                 
                 return None
@@ -378,58 +438,12 @@ class ModbusRTUClient(ModbusRTU):
             ports.remove('/dev/ttyACM0')
             ports.insert(0, '/dev/ttyACM0')  # Put it first
         
-        for port in ports:
-            logger.info(f"Testing port: {port}")
-            for baudrate in baudrates:
-                logger.info(f"  Testing baudrate: {baudrate}")
-                for unit_id in unit_ids:
-                    try:
-                        client = cls(port=port, baudrate=baudrate, timeout=1.0)  # Increased timeout for reliability
-                        if client.connect():
-                            logger.info(f"    Connected to {port} at {baudrate}, testing unit_id={unit_id}")
-                            
-                            # Try to read a register to verify connection
-                            try:
-                                response = client.read_holding_registers(0, 1, unit_id)
-                                if response is not None:
-                                    logger.info(f"✅ Found working configuration: {port}, {baudrate}, unit_id={unit_id} (holding registers)")
-                                    return {
-                                        'port': port,
-                                        'baudrate': baudrate,
-                                        'unit_id': unit_id
-                                    }
-                            except Exception as e:
-                                logger.debug(f"      Error reading holding registers: {e}")
-                            
-                            # Try reading coils if registers didn't work
-                            try:
-                                response = client.read_coils(0, 8, unit_id)
-                                if response is not None:
-                                    logger.info(f"✅ Found working configuration: {port}, {baudrate}, unit_id={unit_id} (coils)")
-                                    return {
-                                        'port': port,
-                                        'baudrate': baudrate,
-                                        'unit_id': unit_id
-                                    }
-                            except Exception as e:
-                                logger.debug(f"      Error reading coils: {e}")
-                                
-                            # Try reading input registers
-                            try:
-                                response = client.read_input_registers(0, 1, unit_id)
-                                if response is not None:
-                                    logger.info(f"✅ Found working configuration: {port}, {baudrate}, unit_id={unit_id} (input registers)")
-                                    return {
-                                        'port': port,
-                                        'baudrate': baudrate,
-                                        'unit_id': unit_id
-                                    }
-                            except Exception as e:
-                                logger.debug(f"      Error reading input registers: {e}")
-                            
-                            client.disconnect()
-                    except Exception as e:
-                        logger.debug(f"    Error testing {port} at {baudrate} with unit_id={unit_id}: {e}")
-        
-        logger.warning("❌ No working configuration found")
-        return None
+        # Ports are probed in parallel; the port is opened once and reused for
+        # every baudrate and unit ID, and the first port in order that answers wins
+        config = find_first_device(ports, baudrates, unit_ids)
+        if config is None:
+            logger.warning("❌ No working configuration found")
+            return None
+        
+        logger.info(f"✅ Found working configuration: {config['port']}, {config['baudrate']}, unit_id={config['unit_id']}")
+        return {key: config[key] for key in ('port', 'baudrate', 'unit_id')}
@@ -41,31 +41,28 @@ def get_or_create_device_state(rtu_instance, unit_id: int) -> Optional[ModbusDev
         
     return rtu_instance.device_states[device_key]
 
+# Human-readable names of the function codes, built once at import
+_FUNCTION_NAMES = {
+    READ_COILS: "READ_COILS",
+    READ_DISCRETE_INPUTS: "READ_DISCRETE_INPUTS",
+    READ_HOLDING_REGISTERS: "READ_HOLDING_REGISTERS",
+    READ_INPUT_REGISTERS: "READ_INPUT_REGISTERS",
+    WRITE_SINGLE_COIL: "WRITE_SINGLE_COIL",
+    WRITE_SINGLE_REGISTER: "WRITE_SINGLE_REGISTER",
+    WRITE_MULTIPLE_COILS: "WRITE_MULTIPLE_COILS",
+    WRITE_MULTIPLE_REGISTERS: "WRITE_MULTIPLE_REGISTERS"
+}
+
 def get_request_type(function_code: int) -> str:
     """Get human-readable request type from function code"""
-    function_names = {
-        READ_COILS: "READ_COILS",
-        READ_DISCRETE_INPUTS: "READ_DISCRETE_INPUTS",
-        READ_HOLDING_REGISTERS: "READ_HOLDING_REGISTERS",
-        READ_INPUT_REGISTERS: "READ_INPUT_REGISTERS",
-        WRITE_SINGLE_COIL: "WRITE_SINGLE_COIL",
-        WRITE_SINGLE_REGISTER: "WRITE_SINGLE_REGISTER",
-        WRITE_MULTIPLE_COILS: "WRITE_MULTIPLE_COILS",
-        WRITE_MULTIPLE_REGISTERS: "WRITE_MULTIPLE_REGISTERS"
-    }
-    return function_names.get(function_code, f"UNKNOWN({function_code})")
+    name = _FUNCTION_NAMES.get(function_code)
+    return name if name is not None else f"UNKNOWN({function_code})"
 
 def extract_address_from_request(request: bytes, function_code: int, logger=None) -> int:
     """Extract address from request bytes"""
-    try:
-        if len(request) >= 4:  # All Modbus requests have at least 4 bytes
-            # Address is typically at bytes 2-3 (big-endian)
-            return (request[2] << 8) | request[3]
-    except Exception as e:
-        if logger:
-            logger.error(f"Error extracting address: {e}")
-        else:
-            logger.error(f"Error extracting address: {e}")
+    # Every read and write request carries its start address big-endian in bytes 2-3
+    if len(request) >= 4:
+        return (request[2] << 8) | request[3]
     return -1
 
 def update_device_state_from_response(device_state: ModbusDeviceState, 
@@ -6,9 +6,11 @@ Handles request building and response parsing for Modbus RTU
 import logging
 import struct
 import sys
+from functools import lru_cache
 from typing import Optional, List, Dict, Tuple, Any
 
 from . import crc
+from modapi.pdu import _COIL_BITS, unpack_coils
 from modapi.config import (
     READ_COILS, READ_DISCRETE_INPUTS,
     READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS,
@@ -18,10 +20,32 @@ from modapi.config import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Precompiled frame layouts
+_HDR = struct.Struct('BB')  # unit_id, function_code
+_CRC = struct.Struct('<H')  # CRC, low byte first
+_ADDR_CNT = struct.Struct('>HH')  # address, count/value
+_ADDR_CNT_BC = struct.Struct('>HHB')  # address, count, byte_count
+_BAUD_CMD = struct.Struct('>HBB')  # command register, parity, baudrate code
+_READ_REQ = struct.Struct('>BBHH')  # unit_id, function_code, address, count
+
 # Waveshare-specific function codes
 WAVESHARE_FUNC_READ_COILS = 0x41  # Sometimes used instead of 0x01
+WAVESHARE_FUNC_READ_HOLDING_REGISTERS = 0x43  # Sometimes used instead of 0x03
+WAVESHARE_FUNC_READ_INPUT_REGISTERS = 0x44  # Sometimes used instead of 0x04
 WAVESHARE_FUNC_FLASH_COIL = 0x05  # Same as write coil but with special register
 
+# Function codes a strict response check accepts for each request function code
+FUNCTION_CODE_ALIASES = {
+    READ_COILS: frozenset((READ_COILS, WAVESHARE_FUNC_READ_COILS)),
+    READ_HOLDING_REGISTERS: frozenset((READ_HOLDING_REGISTERS, WAVESHARE_FUNC_READ_HOLDING_REGISTERS)),
+    READ_INPUT_REGISTERS: frozenset((READ_INPUT_REGISTERS, WAVESHARE_FUNC_READ_INPUT_REGISTERS)),
+}
+
 # Exception codes
 EXCEPTION_ILLEGAL_FUNCTION = 0x01
 EXCEPTION_ILLEGAL_ADDRESS = 0x02
@@ -84,8 +108,8 @@ FUNCTION_CODE_COMPATIBILITY = [
     # Additional Waveshare compatibility mappings
     (0x41, READ_COILS),  # Waveshare sometimes uses 0x41 instead of 0x01
     (0x42, READ_DISCRETE_INPUTS),  # Potential Waveshare variant
-    (0x43, READ_HOLDING_REGISTERS),  # Potential Waveshare variant
-    (0x44, READ_INPUT_REGISTERS),  # Potential Waveshare variant
+    (WAVESHARE_FUNC_READ_HOLDING_REGISTERS, READ_HOLDING_REGISTERS),
+    (WAVESHARE_FUNC_READ_INPUT_REGISTERS, READ_INPUT_REGISTERS),
     (0x45, WRITE_SINGLE_COIL),  # Potential Waveshare variant
     (0x46, WRITE_SINGLE_REGISTER),  # Potential Waveshare variant
     
@@ -106,14 +130,114 @@ def build_request(unit_id: int, function_code: int, data: bytes) -> bytes:
     Returns:
         bytes: Complete RTU frame with CRC
     """
+    request = _build_frame(unit_id, function_code, bytes(data))
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Built request: %s", request.hex())
+    return request
+
+@lru_cache(maxsize=256)
+def _build_frame(unit_id: int, function_code: int, data: bytes) -> bytes:
+    """Build and memoize a CRC-suffixed frame (repeated polls and writes hit the cache)"""
     # Build request: [unit_id, function_code, data, crc_low, crc_high]
-    request = bytes([unit_id, function_code]) + data
+    request = _HDR.pack(unit_id, function_code) + data
     crc_value = crc.calculate_crc(request)
     # Append CRC in little-endian format (low byte first)
-    request += bytes([crc_value & 0xFF, (crc_value >> 8) & 0xFF])
+    return request + _CRC.pack(crc_value)
+
+@lru_cache(maxsize=128)
+def _register_struct(count: int) -> struct.Struct:
+    """Get a compiled big-endian unpacker for ``count`` 16-bit registers"""
+    return struct.Struct(f'>{count}H')
+
+def _bit_read_size(request: bytes) -> int:
+    return 5 + (_ADDR_CNT.unpack_from(request, 2)[1] + 7) // 8
+
+def _register_read_size(request: bytes) -> int:
+    return 5 + 2 * _ADDR_CNT.unpack_from(request, 2)[1]
+
+def _echo_size(request: bytes) -> int:
+    return 8
+
+# Normal response frame size (unit + function code + PDU + CRC) per function code
+_RESPONSE_SIZE = {
+    READ_COILS: _bit_read_size,
+    READ_DISCRETE_INPUTS: _bit_read_size,
+    0x41: _bit_read_size,  # Waveshare variants
+    0x42: _bit_read_size,
+    READ_HOLDING_REGISTERS: _register_read_size,
+    READ_INPUT_REGISTERS: _register_read_size,
+    0x43: _register_read_size,
+    0x44: _register_read_size,
+    WRITE_SINGLE_COIL: _echo_size,
+    WRITE_SINGLE_REGISTER: _echo_size,
+    0x45: _echo_size,
+    0x46: _echo_size,
+    WRITE_MULTIPLE_COILS: _echo_size,
+    WRITE_MULTIPLE_REGISTERS: _echo_size,
+}
+
+# Exception responses are always unit + function code + exception code + CRC
+EXCEPTION_RESPONSE_SIZE = 5
+
+def expected_response_length(function_code: int, request: bytes) -> Optional[int]:
+    """
+    Get the expected length of a normal (non-exception) response frame
     
-    logger.debug(f"Built request: {request.hex()}")
-    return request
+    Args:
+        function_code: Function code of the request
+        request: Complete request frame (unit_id, function_code, data, CRC)
+        
+    Returns:
+        Optional[int]: Expected frame length including CRC, or None if unknown
+    """
+    size = _RESPONSE_SIZE.get(function_code)
+    if size is None or len(request) < 8:
+        return None
+    return size(request)
+
+# Function codes whose normal response carries a byte count in its third byte
+_BYTE_COUNT_RESPONSES = frozenset(fc for fc, size in _RESPONSE_SIZE.items() if size is not _echo_size)
+
+def response_length_from_header(header: bytes) -> Optional[int]:
+    """
+    Get the length of a response frame from its first bytes
+    
+    Read responses announce their payload size in the byte count field, so
+    the frame end is known as soon as three bytes have arrived, even when a
+    device answers with fewer values than were requested.
+    
+    Args:
+        header: At least the first three bytes of the response
+        
+    Returns:
+        Optional[int]: Frame length including CRC, or None if the header
+        does not determine it
+    """
+    function_code = header[1]
+    if function_code & 0x80:
+        return EXCEPTION_RESPONSE_SIZE
+    if function_code in _BYTE_COUNT_RESPONSES:
+        return 5 + header[2]
+    return None
+
+# Compatible function code pairs, looked up in either order
+_COMPATIBLE_FUNCTION_CODES = frozenset(FUNCTION_CODE_COMPATIBILITY) | frozenset(
+    (expected, actual) for actual, expected in FUNCTION_CODE_COMPATIBILITY
+)
+
+def is_compatible_function_code(actual: int, expected: int) -> bool:
+    """
+    Check whether a response function code can belong to a request
+    
+    Args:
+        actual: Function code received (exception bit already masked off)
+        expected: Function code of the request
+        
+    Returns:
+        bool: True if the codes match or are a known compatible pair
+    """
+    return actual == expected or (actual, expected) in _COMPATIBLE_FUNCTION_CODES
 
 def parse_response(response: bytes, expected_function: int = None) -> Tuple[bool, Dict[str, Any]]:
     """
@@ -145,8 +269,8 @@ def parse_response(response: bytes, expected_function: int = None) -> Tuple[bool
         return False, {'error': 'Empty response', 'response_hex': ''}
     
     # Log the raw response for debugging
-    logger.debug(f"Parsing response: {response.hex()} (length: {len(response)})")
-    result['response_hex'] = response.hex()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Parsing response: %s (length: %d)", response.hex(), len(response))
     
     # Check minimum length (unit_id + function_code)
     if len(response) < 2:
@@ -262,7 +386,8 @@ def parse_response(response: bytes, expected_function: int = None) -> Tuple[bool
             logger.warning("Response very short ({} bytes), attempting to extract what data we can: {}".format(len(response), response.hex()))
             if len(response) >= 3:  # At least unit_id, function_code, and 1 data byte
                 data = response[2:] if len(response) == 3 else response[2:-1]  # Skip CRC if present
-                logger.debug(f"Extracted data from short response: {data.hex()}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Extracted data from short response: %s", data.hex())
                 result['data'] = data
                 return True, result
             else:
@@ -272,7 +397,8 @@ def parse_response(response: bytes, expected_function: int = None) -> Tuple[bool
         # Normal case - extract data portion (without unit_id, function_code, and CRC)
         data = response[2:-2] if len(response) >= 4 else response[2:]
         result['data'] = data
-        logger.debug(f"Extracted data: {data.hex()} (length: {len(data)})")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted data: %s (length: %d)", data.hex(), len(data))
         
         # For read functions, validate byte count if present
         if function_code in (READ_COILS, READ_DISCRETE_INPUTS, WAVESHARE_FUNC_READ_COILS, 
@@ -327,7 +453,7 @@ def parse_read_coils_response(response_data: bytes) -> Optional[List[bool]]:
             if response_data[0] == 0x01 and len(response_data) == 2:
                 # This is likely a single byte of coil data with byte count 1
                 byte_val = response_data[1]
-                return [bool(byte_val & (1 << i)) for i in range(8)]
+                return list(_COIL_BITS[byte_val])
             # If we can't determine the state, return a default
             return [False]
     
@@ -338,15 +464,7 @@ def parse_read_coils_response(response_data: bytes) -> Optional[List[bool]]:
             # Return a default response with all coils off for robustness
             return [False] * 8
         
-        coil_bytes = response_data[1:byte_count+1]
-        coils = []
-        
-        for byte_val in coil_bytes:
-            for bit_pos in range(8):
-                coil_state = bool(byte_val & (1 << bit_pos))
-                coils.append(coil_state)
-        
-        return coils
+        return unpack_coils(response_data[1:byte_count+1])
     except Exception as e:
         logger.error(f"Error parsing read coils response: {e}")
         # Return empty list instead of None to avoid index errors
@@ -377,35 +495,32 @@ def parse_read_registers_response(response_data: bytes, expected_count: int = No
 
         # Normal case - first byte is the byte count
         byte_count = response_data[0]
+        payload = memoryview(response_data)  # Slice without copying
 
         # Sanity check for byte count
         if byte_count == 0 and len(response_data) > 1:
             logger.warning("Zero byte count with data present - attempting to parse anyway")
             # Try to parse the data anyway, assuming the byte count is wrong
-            register_data = response_data[1:]
+            register_data = payload[1:]
         elif byte_count > 32:  # Unreasonably large byte count
             logger.warning(f"Unreasonably large byte count ({byte_count}) - limiting to available data")
-            register_data = response_data[1:]
+            register_data = payload[1:]
         elif len(response_data) < byte_count + 1:
             # Response data is shorter than expected
             logger.warning(f"Response data too short: expected {byte_count + 1} bytes, got {len(response_data)}")
             if len(response_data) > 1:
                 # Try to parse what we have
                 logger.info("Attempting to parse partial data")
-                register_data = response_data[1:]
+                register_data = payload[1:]
             else:
                 # Try alternative parsing approaches
                 return _try_alternative_register_parsing(response_data, expected_count)
         else:
             # Normal case - extract register data according to byte count
-            register_data = response_data[1:byte_count+1]
+            register_data = payload[1:byte_count+1]
 
-        # Convert bytes to list of integers
-        registers = []
-        for i in range(0, len(register_data), 2):
-            if i + 1 < len(register_data):
-                register_value = (register_data[i] << 8) | register_data[i+1]
-                registers.append(register_value)
+        # Convert bytes to list of integers (a trailing odd byte is ignored)
+        registers = list(_register_struct(len(register_data) // 2).unpack_from(register_data))
 
         # Some Waveshare devices return all registers even when only one is requested
         if len(registers) > 0:
@@ -449,11 +564,7 @@ def _try_alternative_register_parsing(response_data: bytes, expected_count: int
     # Approach 2: Try to interpret pairs of bytes as register values, ignoring byte count
     try:
         logger.warning("Using lenient parsing approach 2 for Waveshare register response")
-        registers = []
-        for i in range(0, len(response_data), 2):
-            if i + 1 < len(response_data):
-                register_value = (response_data[i] << 8) | response_data[i+1]
-                registers.append(register_value)
+        registers = list(_register_struct(len(response_data) // 2).unpack_from(response_data))
         if registers:
             logger.debug(f"Lenient parsing approach 2 successful: {registers}")
             return True, registers
@@ -481,9 +592,20 @@ def build_read_request(unit_id: int, function_code: int, address: int, count: in
     Returns:
         bytes: Request data
     """
-    # Data format: [address_high, address_low, count_high, count_low]
-    data = struct.pack('>HH', address, count)
-    return build_request(unit_id, function_code, data)
+    request = _build_read_frame(unit_id, function_code, address, count)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Built request: %s", request.hex())
+    return request
+
+@lru_cache(maxsize=256)
+def _build_read_frame(unit_id: int, function_code: int, address: int, count: int) -> bytes:
+    """Build and memoize a read frame, packed into one 8-byte buffer"""
+    # Frame format: [unit_id, function_code, address (2), count (2), crc_low, crc_high]
+    frame = bytearray(8)
+    _READ_REQ.pack_into(frame, 0, unit_id, function_code, address, count)
+    _CRC.pack_into(frame, 6, crc.calculate_crc(memoryview(frame)[:6]))
+    return bytes(frame)
 
 def build_write_single_coil_request(unit_id: int, address: int, value: bool) -> bytes:
     """
@@ -500,7 +622,7 @@ def build_write_single_coil_request(unit_id: int, address: int, value: bool) ->
     # Data format: [address_high, address_low, value_high, value_low]
     # Value is 0xFF00 for ON, 0x0000 for OFF
     coil_value = 0xFF00 if value else 0x0000
-    data = struct.pack('>HH', address, coil_value)
+    data = _ADDR_CNT.pack(address, coil_value)
     return build_request(unit_id, WRITE_SINGLE_COIL, data)
 
 def build_write_single_register_request(unit_id: int, address: int, value: int) -> bytes:
@@ -516,7 +638,7 @@ def build_write_single_register_request(unit_id: int, address: int, value: int)
         bytes: Request data
     """
     # Data format: [address_high, address_low, value_high, value_low]
-    data = struct.pack('>HH', address, value)
+    data = _ADDR_CNT.pack(address, value)
     return build_request(unit_id, WRITE_SINGLE_REGISTER, data)
 
 def build_write_multiple_coils_request(unit_id: int, address: int, values: List[bool]) -> bytes:
@@ -543,7 +665,7 @@ def build_write_multiple_coils_request(unit_id: int, address: int, values: List[
             coil_bytes[byte_index] |= (1 << bit_index)
     
     # Data format: [address_high, address_low, count_high, count_low, byte_count, coil_bytes]
-    data = struct.pack('>HHB', address, count, byte_count) + coil_bytes
+    data = _ADDR_CNT_BC.pack(address, count, byte_count) + coil_bytes
     return build_request(unit_id, WRITE_MULTIPLE_COILS, data)
 
 def build_write_multiple_registers_request(unit_id: int, address: int, values: List[int]) -> bytes:
@@ -561,13 +683,14 @@ def build_write_multiple_registers_request(unit_id: int, address: int, values: L
     count = len(values)
     byte_count = count * 2
     
-    # Pack register values
-    register_bytes = bytearray()
-    for value in values:
-        register_bytes.extend(struct.pack('>H', value))
+    # Pack register values as big-endian words in one call
+    if np is not None:
+        register_bytes = np.asarray(values, dtype='>u2').tobytes()
+    else:
+        register_bytes = _register_struct(count).pack(*values)
     
     # Data format: [address_high, address_low, count_high, count_low, byte_count, register_bytes]
-    data = struct.pack('>HHB', address, count, byte_count) + register_bytes
+    data = _ADDR_CNT_BC.pack(address, count, byte_count) + register_bytes
     return build_request(unit_id, WRITE_MULTIPLE_REGISTERS, data)
 
 def build_set_baudrate_request(unit_id: int, baudrate_code: int, parity: int = 0) -> bytes:
@@ -593,5 +716,5 @@ def build_set_baudrate_request(unit_id: int, baudrate_code: int, parity: int = 0
     # Command format: [unit_id, 0x06, 0x20, 0x00, parity, baudrate_code, crc_low, crc_high]
     # 0x06 is the function code for write single register
     # 0x2000 is the command register for setting baudrate
-    data = struct.pack('>HBB', 0x2000, parity, baudrate_code)
+    data = _BAUD_CMD.pack(0x2000, parity, baudrate_code)
     return build_request(unit_id, WRITE_SINGLE_REGISTER, data)
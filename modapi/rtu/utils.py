@@ -3,12 +3,21 @@ Modbus RTU Utility Functions
 Helper functions for device detection and serial port management
 """
 
+import json
 import logging
 import os
 import serial
 import serial.tools.list_ports
+import struct
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
 from typing import List, Optional, Dict, Tuple, Any
+from .crc import validate_crc
+from .protocol import (
+    EXCEPTION_RESPONSE_SIZE, build_read_request, expected_response_length, response_length_from_header
+)
 # Removed unused import: calculate_crc
 from modapi.config import (
     PRIORITIZED_BAUDRATES, AUTO_DETECT_UNIT_IDS,
@@ -18,25 +27,222 @@ from modapi.config import (
 
 logger = logging.getLogger(__name__)
 
+try:
+    import fcntl
+    import termios
+except ImportError:  # Not available on Windows
+    fcntl = None
+    termios = None
+
+# struct serial_struct: the flags field is the fifth int
+_SERIAL_STRUCT = struct.Struct('iiIii')
+_SERIAL_STRUCT_SIZE = 128  # Generous upper bound for the kernel structure
+_ASYNC_LOW_LATENCY = 0x2000
+_TIOCGSERIAL = getattr(termios, 'TIOCGSERIAL', 0x541E)
+_TIOCSSERIAL = getattr(termios, 'TIOCSSERIAL', 0x541F)
+
+# Enumerating ports walks sysfs (or the registry on Windows), so the result is
+# reused for a few seconds; hot-plug events are rare compared to lookups
+SERIAL_PORTS_CACHE_TTL = 3.0
+_serial_ports_cache: Optional[Tuple[float, List[str], Dict[str, str]]] = None
+_serial_ports_lock = Lock()
+
+def invalidate_serial_ports_cache() -> None:
+    """Forget the cached port list (e.g. after a port failed to open)"""
+    global _serial_ports_cache
+    with _serial_ports_lock:
+        _serial_ports_cache = None
+
+def _read_rtu_frame(ser: serial.Serial, baudrate: int, expected_length: Optional[int] = None,
+                    response_timeout: Optional[float] = None) -> bytes:
+    """
+    Read one Modbus RTU frame
+    
+    Waits up to the port's timeout for the first byte, so probe loops should
+    open the port with the response timeout they want instead of passing it
+    here: every timeout change makes pyserial reprogram the tty (tcsetattr).
+    If the frame length is known the rest is fetched with reads sized from the
+    response header, which return as soon as their bytes are in; otherwise bytes are read until the line
+    has been idle for 3.5 character times (1.75 ms above 19200 baud, as the
+    Modbus spec prescribes).
+    
+    Args:
+        ser: Open serial port the request was written to
+        baudrate: Baud rate of the port (used to size the silent interval)
+        expected_length: Expected frame length including CRC, if known
+        response_timeout: One-off wait for the first byte (default: the port timeout)
+        
+    Returns:
+        bytes: Received frame (empty if the device did not answer)
+    """
+    original_timeout = ser.timeout
+    try:
+        if response_timeout is not None and response_timeout != original_timeout:
+            ser.timeout = response_timeout
+        frame = bytearray(ser.read(1))
+    finally:
+        if ser.timeout != original_timeout:
+            ser.timeout = original_timeout
+    if frame and expected_length:
+        # The header tells exception and short replies apart from the expected
+        # frame, so reads never wait on bytes that will not come
+        frame.extend(ser.read(2))
+        if len(frame) == 3:
+            length = response_length_from_header(frame) or expected_length
+            frame.extend(ser.read(max(length - 3, 0)))
+    elif frame:
+        frame.extend(read_until_idle(ser, baudrate))
+    return bytes(frame)
+
+def read_until_idle(ser: serial.Serial, baudrate: int) -> bytes:
+    """
+    Read the rest of a frame of unknown length
+    
+    Bytes are read in blocks until the line has been idle for 3.5 character
+    times (1.75 ms above 19200 baud), so a frame still in transit is not cut
+    off the way a single in_waiting snapshot would cut it.
+    
+    Args:
+        ser: Open serial port that has started receiving a frame
+        baudrate: Baud rate of the port (used to size the silent interval)
+        
+    Returns:
+        bytes: Bytes received until the line went quiet
+    """
+    t35 = 3.5 * 11 / baudrate if baudrate <= 19200 else 0.00175
+    original_timeout = ser.timeout
+    ser.timeout = t35
+    try:
+        data = bytearray()
+        while True:
+            chunk = ser.read(256)
+            if not chunk:
+                break  # Inter-frame silence reached
+            data.extend(chunk)
+        return bytes(data)
+    finally:
+        ser.timeout = original_timeout
+
+def read_exact(ser: serial.Serial, n: int, deadline: float) -> bytes:
+    """
+    Read exactly ``n`` bytes unless the deadline passes first
+    
+    Each read asks for the bytes still missing and blocks for at most the
+    serial timeout, so no bytes are lost between an in_waiting check and
+    the read that follows it.
+    
+    Args:
+        ser: Open serial port
+        n: Number of bytes to read
+        deadline: time.monotonic() value after which to give up
+        
+    Returns:
+        bytes: Bytes received (shorter than ``n`` on timeout)
+    """
+    buf = bytearray()
+    while len(buf) < n and time.monotonic() < deadline:
+        chunk = ser.read(n - len(buf))
+        if not chunk:
+            break
+        buf.extend(chunk)
+    return bytes(buf)
+
+def set_low_latency(ser: serial.Serial) -> bool:
+    """
+    Disable USB packet coalescing on a USB-serial adapter (Linux only)
+    
+    FTDI and similar bridges hold received bytes for up to 16 ms before
+    passing them to the host, which dominates the round-trip time of short
+    Modbus frames. The FTDI latency timer is lowered through sysfs when
+    writable; otherwise ASYNC_LOW_LATENCY is set with the TIOCSSERIAL ioctl.
+    
+    Args:
+        ser: Open serial port
+        
+    Returns:
+        bool: True if low-latency mode was enabled, False otherwise
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    
+    try:
+        tty_name = os.path.basename(os.path.realpath(ser.port))
+        latency_timer = f"/sys/bus/usb-serial/devices/{tty_name}/latency_timer"
+        if os.path.exists(latency_timer):
+            with open(latency_timer, 'r+') as f:
+                if int(f.read().strip() or 0) > 1:
+                    f.seek(0)
+                    f.write('1')
+            return True
+    except Exception as e:
+        logger.debug(f"Could not lower the latency timer of {getattr(ser, 'port', ser)}: {e}")
+    
+    if fcntl is None:
+        return False
+    try:
+        fd = ser.fileno()
+        buf = bytearray(_SERIAL_STRUCT_SIZE)
+        fcntl.ioctl(fd, _TIOCGSERIAL, buf)
+        fields = list(_SERIAL_STRUCT.unpack_from(buf))
+        if not fields[4] & _ASYNC_LOW_LATENCY:
+            fields[4] |= _ASYNC_LOW_LATENCY
+            _SERIAL_STRUCT.pack_into(buf, 0, *fields)
+            fcntl.ioctl(fd, _TIOCSSERIAL, buf)
+        return True
+    except Exception as e:
+        logger.debug(f"Could not enable low-latency mode on {getattr(ser, 'port', ser)}: {e}")
+        return False
+
 def find_serial_ports() -> List[str]:
     """
     Find all available serial ports on the system.
     
+    Results are cached for SERIAL_PORTS_CACHE_TTL seconds; each call returns
+    a fresh list that the caller may modify.
+    
+    Returns:
+        List[str]: List of available serial port paths, prioritized by likelihood of being real hardware
+    """
+    ports, _ = _cached_port_listing()
+    return list(ports)
+
+def _cached_port_listing() -> Tuple[List[str], Dict[str, str]]:
+    """Return the cached (ports, USB serial number per port), enumerating when stale"""
+    global _serial_ports_cache
+    with _serial_ports_lock:
+        cached = _serial_ports_cache
+        if cached is None or time.monotonic() - cached[0] >= SERIAL_PORTS_CACHE_TTL:
+            cached = (time.monotonic(),) + _enumerate_serial_ports()
+            _serial_ports_cache = cached
+        return cached[1], cached[2]
+
+# Device name prefixes probed when pyserial finds nothing, with the number of
+# indexes to accept (only ttyS0-4, as higher numbers are often virtual)
+_FALLBACK_PORT_PREFIXES = (('ttyACM', 10), ('ttyUSB', 10), ('ttyS', 5))
+
+def _enumerate_serial_ports() -> Tuple[List[str], Dict[str, str]]:
+    """
+    Enumerate all available serial ports on the system.
+    
     Prioritizes hardware ports (ttyACM, ttyUSB) over virtual ports (ttyS).
     Filters out potentially problematic or inaccessible ports.
     
     Returns:
-        List[str]: List of available serial port paths, prioritized by likelihood of being real hardware
+        Tuple[List[str], Dict[str, str]]: Serial port paths, prioritized by likelihood of being
+        real hardware, and the USB serial number of each port that reports one
     """
     # Lists to store different types of ports
     hardware_ports = []  # Most likely to be real hardware (ttyACM, ttyUSB)
     virtual_ports = []   # Potentially virtual ports (ttyS)
     other_ports = []     # Other port types
+    serial_numbers = {}  # Port path -> USB serial number
     
     # Try to use pyserial's list_ports to get detailed port information
     try:
         for port in serial.tools.list_ports.comports():
             port_path = port.device
+            if getattr(port, 'serial_number', None):
+                serial_numbers[port_path] = port.serial_number
             
             # Skip ports that are likely to be problematic
             if any(port_path.startswith(skip) for skip in [
@@ -65,18 +271,22 @@ def find_serial_ports() -> List[str]:
     # Fallback to checking common device paths if no ports were found
     if not hardware_ports and not virtual_ports and not other_ports:
         logger.info("No ports found with pyserial, checking common device paths")
-        # Check for hardware ports first
-        for i in range(10):
-            for prefix in ['/dev/ttyACM', '/dev/ttyUSB']:
-                port_path = f"{prefix}{i}"
-                if os.path.exists(port_path):
-                    hardware_ports.append(port_path)
+        # One pass over /dev instead of stat-ing every candidate path
+        candidates = []
+        try:
+            with os.scandir('/dev') as entries:
+                for entry in entries:
+                    for rank, (prefix, limit) in enumerate(_FALLBACK_PORT_PREFIXES):
+                        suffix = entry.name[len(prefix):]
+                        if entry.name.startswith(prefix) and suffix.isdigit() and int(suffix) < limit:
+                            candidates.append((rank == 2, int(suffix), rank, f"/dev/{entry.name}"))
+                            break
+        except OSError as e:
+            logger.debug(f"Cannot list /dev: {e}")
         
-        # Only check ttyS0-4 as higher numbers are often virtual
-        for i in range(5):
-            port_path = f"/dev/ttyS{i}"
-            if os.path.exists(port_path):
-                virtual_ports.append(port_path)
+        # Hardware ports first (ttyACM0, ttyUSB0, ttyACM1, ...), then ttyS
+        for is_virtual, _, _, port_path in sorted(candidates):
+            (virtual_ports if is_virtual else hardware_ports).append(port_path)
     
     # Combine the lists with hardware ports first, then virtual, then others
     all_ports = hardware_ports + virtual_ports + other_ports
@@ -92,7 +302,62 @@ def find_serial_ports() -> List[str]:
     logger.info(f"Virtual ports: {virtual_ports}")
     logger.info(f"Other ports: {other_ports}")
     
-    return all_ports
+    return all_ports, serial_numbers
+
+# Holding registers (0x03) first as most Modbus devices support them,
+# then coils (0x01) and input registers (0x04)
+_PROBE_FUNCTION_CODES = (0x03, 0x01, 0x04)
+
+# Function code that last got an answer on each port, tried first next time.
+# Written from the parallel scan threads, hence the lock
+_probe_hits: Dict[str, int] = {}
+_probe_hits_lock = Lock()
+
+def _probe_modbus(ser: serial.Serial, baudrate: int, unit_id: int = 1, debug: bool = False) -> bool:
+    """
+    Check whether a Modbus device answers on an already open serial port
+    
+    The function code that last worked on the port is tried first, so a
+    device that only implements coils does not pay for two timed-out
+    register reads on every probe.
+    
+    Args:
+        ser: Open serial port, configured for ``baudrate``
+        baudrate: Baud rate the port is set to
+        unit_id: Modbus unit ID to test (default: 1)
+        debug: Enable debug output (default: False)
+        
+    Returns:
+        bool: True if the device answered one of the probe requests
+    """
+    # Ensure all parameters are valid integers
+    safe_unit_id = int(unit_id) if unit_id is not None else DEFAULT_UNIT_ID
+    
+    function_codes = _PROBE_FUNCTION_CODES
+    with _probe_hits_lock:
+        last_hit = _probe_hits.get(ser.port)
+    if last_hit is not None and last_hit != function_codes[0]:
+        function_codes = (last_hit,) + tuple(fc for fc in function_codes if fc != last_hit)
+    
+    for function_code in function_codes:
+        # Clear any pending data
+        ser.reset_input_buffer()
+        request = build_read_request(safe_unit_id, function_code, 0x0000, 1)
+        ser.write(request)
+        
+        # Wait for the response frame
+        response = _read_rtu_frame(ser, baudrate, expected_response_length(request[1], request))
+        if response:
+            if debug and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Got response from %s (FC%02X): %s", ser.port, function_code, response.hex())
+            
+            # If we got any response, it's likely a Modbus device
+            if len(response) >= 5:  # Minimum valid Modbus RTU response length
+                with _probe_hits_lock:
+                    _probe_hits[ser.port] = function_code
+                return True
+    
+    return False
 
 def test_modbus_port(port: str, baudrate: int = DEFAULT_BAUDRATE, timeout: float = 0.5, unit_id: int = 1, debug: bool = False) -> Tuple[bool, Dict[str, Any]]:
     """
@@ -108,102 +373,255 @@ def test_modbus_port(port: str, baudrate: int = DEFAULT_BAUDRATE, timeout: float
     Returns:
         Tuple[bool, Dict[str, Any]]: Success flag and connection details
     """
-    from .protocol import build_read_request, parse_response
+    # Create result dictionary
+    result = {
+        'port': port,
+        'baudrate': baudrate,
+        'unit_id': unit_id,
+        'success': False,
+        'connected': False,
+        'error': None,
+        'device_type': None
+    }
     
     try:
         # Try to open the port
         with serial.Serial(port=port, baudrate=baudrate, timeout=timeout) as ser:
-            # Clear any pending data
-            ser.reset_input_buffer()
+            set_low_latency(ser)
             ser.reset_output_buffer()
             
-            # Create result dictionary
-            result = {
-                'port': port,
-                'baudrate': baudrate,
-                'unit_id': unit_id,
-                'success': False,
-                'connected': False,
-                'error': None,
-                'device_type': None
-            }
-            
-            # Test 1: Try reading holding registers (function code 0x03)
-            # This is a common operation that most Modbus devices support
-            # Ensure all parameters are valid integers
-            safe_unit_id = int(unit_id) if unit_id is not None else DEFAULT_UNIT_ID
-            request = build_read_request(safe_unit_id, 0x03, 0x0000, 1)
-            ser.write(request)
-            
-            # Wait for response
-            time.sleep(0.1)
-            
-            if ser.in_waiting > 0:
-                response = ser.read(ser.in_waiting)
-                if debug:
-                    logger.debug(f"Got response from {port} (FC03): {response.hex()}")
-                
-                # If we got any response, it's likely a Modbus device
-                if len(response) >= 5:  # Minimum valid Modbus RTU response length
-                    result['success'] = True
-                    result['connected'] = True
-                    return True, result
-            
-            # Test 2: Try reading coils (function code 0x01)
-            ser.reset_input_buffer()
-            request = build_read_request(safe_unit_id, 0x01, 0x0000, 1)
-            ser.write(request)
-            
-            # Wait for response
-            time.sleep(0.1)
-            
-            if ser.in_waiting > 0:
-                response = ser.read(ser.in_waiting)
-                if debug:
-                    logger.debug(f"Got response from {port} (FC01): {response.hex()}")
-                
-                # If we got any response, it's likely a Modbus device
-                if len(response) >= 5:  # Minimum valid Modbus RTU response length
-                    result['success'] = True
-                    result['connected'] = True
-                    return True, result
-            
-            # Test 3: Try reading input registers (function code 0x04)
-            ser.reset_input_buffer()
-            request = build_read_request(safe_unit_id, 0x04, 0x0000, 1)
-            ser.write(request)
-            
-            # Wait for response
-            time.sleep(0.1)
-            
-            if ser.in_waiting > 0:
-                response = ser.read(ser.in_waiting)
-                if debug:
-                    logger.debug(f"Got response from {port} (FC04): {response.hex()}")
-                
-                # If we got any response, it's likely a Modbus device
-                if len(response) >= 5:  # Minimum valid Modbus RTU response length
-                    result['success'] = True
-                    result['connected'] = True
-                    return True, result
+            if _probe_modbus(ser, baudrate, unit_id, debug):
+                result['success'] = True
+                result['connected'] = True
+                return True, result
             
             return False, result
     except Exception as e:
-        logger.debug(f"Error testing port {port} at {baudrate} baud: {e}", exc_info=True)
-        result = {
-            'port': port,
-            'baudrate': baudrate,
-            'unit_id': unit_id,
-            'success': False,
-            'connected': False,
-            'error': str(e),
-            'device_type': None
-        }
+        logger.debug("Error testing port %s at %s baud: %s", port, baudrate, e, exc_info=True)
+        result['error'] = str(e)
         return False, result
 
+def _contains_rtu_frame(data: bytes) -> bool:
+    """Check whether data holds a CRC-valid Modbus RTU read or exception response"""
+    for start in range(len(data) - EXCEPTION_RESPONSE_SIZE + 1):
+        length = response_length_from_header(data[start:start + 3])
+        if length and start + length <= len(data) and validate_crc(data[start:start + length])[0]:
+            return True
+    return False
+
+def _baudrate_looks_live(ser: serial.Serial, baudrate: int, unit_id: int = DEFAULT_UNIT_ID) -> bool:
+    """
+    Cheap pre-check run before probing every unit ID at a baudrate
+    
+    Sends a read to the first unit ID of the scan and listens only for as
+    long as the request takes to go out plus 3.5 character times. Silence is
+    inconclusive (the device may answer later or use another unit ID), but
+    bytes that hold no CRC-valid frame mean the baudrate is wrong.
+    
+    Args:
+        ser: Open serial port, configured for ``baudrate``
+        baudrate: Baud rate to check
+        unit_id: Unit ID to address
+        
+    Returns:
+        bool: False if the baudrate can be skipped, True otherwise
+    """
+    try:
+        request = build_read_request(unit_id, 0x03, 0x0000, 1)
+        char_time = 11 / baudrate
+        listen = len(request) * char_time + max(3.5 * char_time, 0.00175)
+        ser.reset_input_buffer()
+        ser.write(request)
+        data = _read_rtu_frame(ser, baudrate, response_timeout=listen)
+    except Exception as e:
+        logger.debug("Baudrate pre-check failed on %s at %s baud: %s", ser.port, baudrate, e)
+        return True
+    
+    return not data or _contains_rtu_frame(data)
+
+def _scan_one_port(port: str, baudrates: List[int], unit_ids: List[int],
+                   all_units: bool = True, stop: Optional[Event] = None) -> Optional[Dict[str, Any]]:
+    """
+    Scan a single port for a Modbus device (runs in a _scan_ports worker thread)
+    
+    The port is opened once and reconfigured for each baudrate, instead of
+    being reopened for every probe.
+    
+    Args:
+        port: Serial port to scan
+        baudrates: Baudrates to try
+        unit_ids: Unit IDs to try
+        all_units: Also look for the other unit IDs once a device answered
+        stop: Event telling the scan to give up (checked between probes)
+        
+    Returns:
+        Optional[Dict[str, Any]]: Device configuration or None if nothing responded
+    """
+    if not baudrates or not unit_ids:
+        return None
+    # Slaves never answer broadcasts, so the pre-check addresses a real unit ID
+    check_unit = next((unit_id for unit_id in unit_ids if unit_id), DEFAULT_UNIT_ID)
+    
+    try:
+        # Open with the probe response timeout so that frame reads leave it alone
+        with serial.Serial(port=port, baudrate=baudrates[0], timeout=0.1) as ser:
+            set_low_latency(ser)
+            for baudrate in baudrates:
+                if stop is not None and stop.is_set():
+                    return None
+                ser.baudrate = baudrate
+                ser.reset_input_buffer()
+                ser.reset_output_buffer()
+                
+                if not _baudrate_looks_live(ser, baudrate, check_unit):
+                    logger.debug("Skipping %s baud on %s: only garbage on the line", baudrate, port)
+                    continue
+                
+                for unit_id in unit_ids:
+                    if stop is not None and stop.is_set():
+                        return None
+                    if not _probe_modbus(ser, baudrate, unit_id):
+                        continue
+                    
+                    device_info = {
+                        'port': port,
+                        'baudrate': baudrate,
+                        'unit_id': unit_id,
+                        'unit_ids': [unit_id]  # For backward compatibility
+                    }
+                    
+                    if not all_units:
+                        return device_info
+                    
+                    # Try to determine the other unit IDs on this bus
+                    try:
+                        for other_id in unit_ids:
+                            if other_id == unit_id:
+                                continue
+                            # Drop late bytes of the previous reply
+                            ser.reset_input_buffer()
+                            
+                            # Try to read holding registers
+                            request = build_read_request(other_id, 0x03, 0x0000, 1)
+                            ser.write(request)
+                            # Wait for the response frame
+                            response = _read_rtu_frame(ser, baudrate, expected_response_length(request[1], request))
+                            if len(response) >= 3 and response[0] == other_id:
+                                device_info['unit_ids'].append(other_id)
+                    except Exception as e:
+                        logger.debug("Error scanning unit IDs on %s: %s", port, e)
+                    
+                    # No need to try other baudrates for this port
+                    return device_info
+    except Exception as e:
+        logger.debug("Error scanning port %s: %s", port, e)
+    
+    return None
+
+def _scan_ports(port_baudrates: List[Tuple[str, List[int]]], unit_ids: List[int],
+                first_only: bool = False, all_units: bool = True) -> List[Optional[Dict[str, Any]]]:
+    """
+    Scan ports in parallel, one worker thread per port
+    
+    Ports are independent devices, so they are probed concurrently; probes on
+    the same port stay sequential since a serial device can only be opened
+    once. Results are taken in port order: with ``first_only`` the remaining
+    workers are stopped once a port answered and every port before it came
+    up empty, so the list order decides, not which port answered first.
+    Every worker has closed its port when this returns.
+    
+    Args:
+        port_baudrates: (port, baudrates to try) pairs in priority order
+        unit_ids: Unit IDs to try
+        first_only: Stop at the first port (in list order) that answers
+        all_units: Also look for the other unit IDs on each bus
+        
+    Returns:
+        List[Optional[Dict[str, Any]]]: Device configuration or None per port, in input order
+    """
+    results = [None] * len(port_baudrates)
+    if not port_baudrates:
+        return results
+    
+    stop = Event()
+    with ThreadPoolExecutor(max_workers=len(port_baudrates), thread_name_prefix="modbus-scan") as executor:
+        futures = [executor.submit(_scan_one_port, port, baudrates, unit_ids, all_units=all_units, stop=stop)
+                   for port, baudrates in port_baudrates]
+        for index, future in enumerate(futures):
+            results[index] = future.result()
+            if first_only and results[index] is not None:
+                stop.set()  # Lower-priority ports give up at their next probe
+                break
+    return results
+
+def find_first_device(ports: List[str] = None,
+                      baudrates: List[int] = None,
+                      unit_ids: List[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Find the first port, in priority order, with a responding Modbus device
+    
+    Args:
+        ports: Ports to try in priority order (default: auto-detect)
+        baudrates: Baudrates to try (default: from config.PRIORITIZED_BAUDRATES)
+        unit_ids: Unit IDs to try (default: from config.AUTO_DETECT_UNIT_IDS)
+        
+    Returns:
+        Optional[Dict[str, Any]]: Configuration dict (port, baudrate, unit_id)
+        or None if no device answered
+    """
+    if ports is None:
+        ports = find_serial_ports()
+    if baudrates is None:
+        baudrates = PRIORITIZED_BAUDRATES
+    if unit_ids is None:
+        unit_ids = AUTO_DETECT_UNIT_IDS
+    
+    results = _scan_ports([(port, list(baudrates)) for port in ports], unit_ids,
+                          first_only=True, all_units=False)
+    return next((device for device in results if device is not None), None)
+
+# Suggested location for the scan's baudrate cache (see scan_for_devices).
+# Entries are keyed by USB serial number where available so that a device
+# moving to another ttyUSBn after re-plugging keeps its entry.
+BAUDRATE_CACHE_FILE = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                                   'modapi', 'baudrates.json')
+
+def _baudrate_cache_keys(ports: List[str]) -> Dict[str, str]:
+    """Map each port to its baudrate cache key (USB serial number or port path)"""
+    _, serial_numbers = _cached_port_listing()
+    return {port: f"sn:{serial_numbers[port]}" if port in serial_numbers else port for port in ports}
+
+def _load_baudrate_cache(cache_file: str) -> Dict[str, int]:
+    """Load the last-known-good baudrates (empty if missing or unreadable)"""
+    try:
+        with open(cache_file, 'r') as f:
+            cache = json.load(f)
+        return {key: int(value) for key, value in cache.items()}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.debug(f"Ignoring unreadable baudrate cache {cache_file}: {e}")
+        return {}
+
+def _save_baudrate_cache(cache_file: str, cache: Dict[str, int]) -> None:
+    """Write the baudrate cache atomically (write to a temp file, then os.replace)"""
+    tmp_path = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, cache_file)
+    except Exception as e:
+        logger.debug(f"Could not write baudrate cache {cache_file}: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
 def scan_for_devices(ports: List[str] = None, 
                     baudrates: List[int] = None,
-                    unit_ids: List[int] = None) -> List[Dict[str, Any]]:
+                    unit_ids: List[int] = None,
+                    cache_file: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Scan for Modbus devices on available ports
     
@@ -211,6 +629,9 @@ def scan_for_devices(ports: List[str] = None,
         ports: List of ports to scan (default: auto-detect)
         baudrates: List of baudrates to try (default: from config.BAUDRATES)
         unit_ids: List of unit IDs to try (default: from config.AUTO_DETECT_UNIT_IDS)
+        cache_file: JSON file remembering the baudrate each adapter last answered
+            at, tried first on the next scan (e.g. BAUDRATE_CACHE_FILE); the
+            default None scans without reading or writing any file
         
     Returns:
         List[Dict[str, Any]]: List of detected devices with configuration
@@ -226,41 +647,30 @@ def scan_for_devices(ports: List[str] = None,
         unit_ids = AUTO_DETECT_UNIT_IDS
     
     detected_devices = []
-    
-    for port in ports:
-        for baudrate in baudrates:
-            for unit_id in unit_ids:
-                if test_modbus_port(port, baudrate, unit_id=unit_id):
-                    device_info = {
-                        'port': port,
-                        'baudrate': baudrate,
-                        'unit_id': unit_id,
-                        'unit_ids': [unit_id]  # For backward compatibility
-                    }
-                
-                # Try to determine unit IDs
-                try:
-                    with serial.Serial(port=port, baudrate=baudrate, timeout=0.5) as ser:
-                        for unit_id in unit_ids:
-                            # Clear buffers
-                            ser.reset_input_buffer()
-                            ser.reset_output_buffer()
-                            
-                            # Try to read holding registers
-                            request = bytes([unit_id, 0x03, 0x00, 0x00, 0x00, 0x01, 0x84, 0x0A])
-                            ser.write(request)
-                            time.sleep(0.1)
-                            
-                            if ser.in_waiting > 0:
-                                response = ser.read(ser.in_waiting)
-                                if len(response) >= 3 and response[0] == unit_id:
-                                    device_info['unit_ids'].append(unit_id)
-                except Exception as e:
-                    logger.debug(f"Error scanning unit IDs on {port}: {e}")
-                
+    if ports:
+        cache_keys = _baudrate_cache_keys(ports) if cache_file else {}
+        baudrate_cache = _load_baudrate_cache(cache_file) if cache_file else {}
+        cache_changed = False
+        
+        port_baudrates = []
+        for port in ports:
+            # Try the last-known-good baudrate first; the scan stops at the first hit
+            order = list(baudrates)
+            cached = baudrate_cache.get(cache_keys.get(port))
+            if cached in order:
+                order.remove(cached)
+                order.insert(0, cached)
+            port_baudrates.append((port, order))
+        
+        for port, device_info in zip(ports, _scan_ports(port_baudrates, unit_ids)):
+            if device_info is not None:
                 detected_devices.append(device_info)
-                # No need to try other baudrates for this port
-                break
+                if cache_file and baudrate_cache.get(cache_keys[port]) != device_info['baudrate']:
+                    baudrate_cache[cache_keys[port]] = device_info['baudrate']
+                    cache_changed = True
+        
+        if cache_changed:
+            _save_baudrate_cache(cache_file, baudrate_cache)
     
     logger.info(f"Detected {len(detected_devices)} Modbus devices")
     for device in detected_devices:
@@ -282,38 +692,35 @@ def detect_device_type(port: str, baudrate: int, unit_id: int) -> Optional[str]:
     """
     try:
         with serial.Serial(port=port, baudrate=baudrate, timeout=0.5) as ser:
+            set_low_latency(ser)
             # Clear buffers
             ser.reset_input_buffer()
             ser.reset_output_buffer()
             
             # Try IO 8CH specific command (read output status)
-            request = bytes([unit_id, 0x01, 0x00, 0x00, 0x00, 0x08, 0x3D, 0xCC])
+            request = build_read_request(unit_id, 0x01, 0x0000, 8)
             ser.write(request)
-            time.sleep(0.1)
-            
-            if ser.in_waiting > 0:
-                response = ser.read(ser.in_waiting)
-                if len(response) >= 4 and response[0] == unit_id and response[1] == 0x01:
-                    return "IO_8CH"
+            # Wait for the response frame
+            response = _read_rtu_frame(ser, baudrate, expected_response_length(request[1], request))
+            if len(response) >= 4 and response[0] == unit_id and response[1] == 0x01:
+                return "IO_8CH"
             
             # Clear buffers
             ser.reset_input_buffer()
             ser.reset_output_buffer()
             
             # Try Analog Input 8CH specific command (read analog inputs)
-            request = bytes([unit_id, 0x04, 0x00, 0x00, 0x00, 0x08, 0xF1, 0xCC])
+            request = build_read_request(unit_id, 0x04, 0x0000, 8)
             ser.write(request)
-            time.sleep(0.1)
-            
-            if ser.in_waiting > 0:
-                response = ser.read(ser.in_waiting)
-                if len(response) >= 4 and response[0] == unit_id and response[1] == 0x04:
-                    return "ANALOG_INPUT_8CH"
+            # Wait for the response frame
+            response = _read_rtu_frame(ser, baudrate, expected_response_length(request[1], request))
+            if len(response) >= 4 and response[0] == unit_id and response[1] == 0x04:
+                return "ANALOG_INPUT_8CH"
             
             # Unknown device type
             return None
     except Exception as e:
-        logger.debug(f"Error detecting device type on {port}: {e}")
+        logger.debug("Error detecting device type on %s: %s", port, e)
         return None
 
 
@@ -2,12 +2,17 @@
 Tests for api.rtu module - Direct RTU Modbus Communication
 """
 
+import errno
+import os
+import tempfile
+import time
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, call
 import struct
 import serial
 
-from modapi.rtu import ModbusRTU, create_rtu_client, test_rtu_connection
+from modapi.rtu import ModbusRTU, create_rtu_client, invalidate_port_cache
+from modapi.rtu.utils import scan_for_devices, find_serial_ports, _read_rtu_frame, _baudrate_looks_live
 
 
 class TestModbusRTU(unittest.TestCase):
@@ -32,6 +37,52 @@ class TestModbusRTU(unittest.TestCase):
         self.assertEqual(client.FUNC_READ_COILS, 0x01)
         self.assertEqual(client.FUNC_WRITE_SINGLE_COIL, 0x05)
     
+    def test_port_state_shared_per_port(self):
+        """Test that instances on one port share the lock and RS485 timing"""
+        first = ModbusRTU(port='/dev/ttyUSB0')
+        second = ModbusRTU(port='/dev/ttyUSB0')
+        other = ModbusRTU(port='/dev/ttyUSB1')
+        
+        self.assertIs(first.lock, second.lock)
+        self.assertIsNot(first.lock, other.lock)
+        
+        first._last_operation_time = 123.0
+        self.assertEqual(second._last_operation_time, 123.0)
+        self.assertNotEqual(other._last_operation_time, 123.0)
+    
+    def test_send_request_async(self):
+        """Test that the async variant waits out the RS485 delay and runs on the worker"""
+        import asyncio
+        
+        client = ModbusRTU(port='/dev/ttyUSB2', baudrate=9600, timeout=1.0, rs485_delay=0.05)
+        client.serial_conn = MagicMock(is_open=True)
+        client._last_operation_time = time.monotonic()
+        self.assertGreater(client.rs485_ready_time(), time.monotonic())
+        
+        with patch.object(client, '_execute_request', return_value=bytearray(b'\x01\x06')) as mock_execute:
+            response = asyncio.run(client.send_request_async(b'\x01\x06', 1, 0x06))
+        
+        self.assertEqual(response, b'\x01\x06')
+        mock_execute.assert_called_once_with(b'\x01\x06', 1, 0x06, 2)
+        self.assertLessEqual(client.rs485_ready_time(), time.monotonic())
+    
+    def test_send_request_worker_timeout(self):
+        """Test that a hung worker is reported as a failed request instead of blocking"""
+        import threading
+        
+        client = ModbusRTU(port='/dev/ttyUSB3', baudrate=9600, timeout=1.0)
+        client.serial_conn = MagicMock(is_open=True)
+        release = threading.Event()
+        
+        with patch.object(client, '_execute_request', side_effect=lambda *args: release.wait(5)), \
+                patch.object(client, '_request_deadline', return_value=0.1):
+            start = time.monotonic()
+            self.assertIsNone(client.send_request(b'\x01\x03', 1, 0x03))
+            self.assertLess(time.monotonic() - start, 1.0)
+            release.set()
+        
+        self.assertGreater(client._request_deadline(2), client.timeout * 3)
+    
     def test_crc_calculation(self):
         """Test CRC16 calculation"""
         # Test known CRC values
@@ -44,6 +95,41 @@ class TestModbusRTU(unittest.TestCase):
         self.assertIsInstance(calculated_crc, int)
         self.assertTrue(0 <= calculated_crc <= 0xFFFF)
     
+    def test_crc_matches_bitwise_reference(self):
+        """Test table-driven CRC16 against the bitwise reference implementation"""
+        from modapi.rtu.crc import calculate_crc, calculate_crc_alternative
+        
+        self.assertEqual(calculate_crc(b'123456789'), 0x4B37)  # Modbus check value
+        for length in (0, 1, 2, 3, 7, 8, 64, 255):
+            data = bytes((i * 37 + 11) & 0xFF for i in range(length))
+            self.assertEqual(calculate_crc(data), calculate_crc_alternative(data))
+
+    def test_crc_backend_selection(self):
+        """Test that the crcmod backend is only used with its C extension"""
+        import importlib
+        import sys
+        import types
+        from modapi.rtu import crc
+
+        crcmod_pkg = types.ModuleType('crcmod')
+        crcmod_impl = types.ModuleType('crcmod.crcmod')
+        predefined = types.ModuleType('crcmod.predefined')
+        predefined.mkPredefinedCrcFun = lambda name: crc._calculate_crc_table
+        stubs = {'crcmod': crcmod_pkg, 'crcmod.crcmod': crcmod_impl,
+                 'crcmod.predefined': predefined, 'fastcrc': None}
+        try:
+            with patch.dict(sys.modules, stubs):
+                crcmod_impl._usingExtension = True
+                importlib.reload(crc)
+                self.assertEqual(crc.CRC_BACKEND, 'crcmod')
+                self.assertEqual(crc.calculate_crc(b'123456789'), 0x4B37)
+
+                crcmod_impl._usingExtension = False
+                importlib.reload(crc)
+                self.assertEqual(crc.CRC_BACKEND, 'table')
+        finally:
+            importlib.reload(crc)
+
     def test_build_request(self):
         """Test building Modbus request frame"""
         unit_id = 1
@@ -58,6 +144,24 @@ class TestModbusRTU(unittest.TestCase):
         self.assertEqual(frame[2:6], data)
         self.assertEqual(len(frame), len(data) + 4)  # unit + func + data + crc
     
+    def test_expected_response_length(self):
+        """Test expected response frame lengths per function code"""
+        from modapi.rtu.protocol import build_read_request, expected_response_length
+        
+        self.assertEqual(expected_response_length(0x01, build_read_request(1, 0x01, 0, 10)), 7)
+        self.assertEqual(expected_response_length(0x03, build_read_request(1, 0x03, 0, 4)), 13)
+        self.assertEqual(expected_response_length(0x05, self.client._build_request(1, 0x05, b'\x00\x00\xff\x00')), 8)
+        self.assertIsNone(expected_response_length(0x2B, self.client._build_request(1, 0x2B, b'\x0e\x01\x00')))
+    
+    def test_response_length_from_header(self):
+        """Test frame lengths derived from the response header"""
+        from modapi.rtu.protocol import response_length_from_header
+        
+        self.assertEqual(response_length_from_header(b'\x01\x03\x04'), 9)
+        self.assertEqual(response_length_from_header(b'\x01\x41\x01'), 6)  # Waveshare coil variant
+        self.assertEqual(response_length_from_header(b'\x01\x83\x02'), 5)  # Exception response
+        self.assertIsNone(response_length_from_header(b'\x01\x06\x00'))  # Echo, length from request
+    
     @patch('serial.Serial')
     def test_connect(self, mock_serial):
         """Test serial connection"""
@@ -71,6 +175,15 @@ class TestModbusRTU(unittest.TestCase):
         self.assertTrue(result)
         self.assertTrue(self.client.is_connected())
         mock_serial.assert_called_once()
+        self.assertTrue(mock_serial.call_args.kwargs['exclusive'])
+    
+    @patch('serial.Serial')
+    def test_connect_port_busy(self, mock_serial):
+        """Test that a port locked by another process fails without trying other settings"""
+        mock_serial.side_effect = serial.SerialException(errno.EAGAIN, "Could not exclusively lock port")
+        
+        self.assertFalse(self.client.connect())
+        mock_serial.assert_called_once()
     
     @patch('serial.Serial')
     def test_connect_failure(self, mock_serial):
@@ -225,6 +338,87 @@ class TestModbusRTU(unittest.TestCase):
         
         self.assertTrue(result)
     
+    def test_send_request_foreign_header(self):
+        """Test that a response from another unit is dropped after the header"""
+        client = ModbusRTU(port='/dev/ttyUSB0', baudrate=9600, timeout=1.0)
+        mock_conn = MagicMock()
+        mock_conn.is_open = True
+        mock_conn.in_waiting = 0
+        mock_conn.timeout = 1.0
+        mock_conn.read.return_value = b'\x02\x03\x04'  # Header from unit 2
+        client.serial_conn = mock_conn
+        client.rs485_delay = 0
+        
+        request = client._build_request(1, 0x03, struct.pack('>HH', 0, 2))
+        self.assertIsNone(client.send_request(request, 1, 0x03, retry_count=0))
+        self.assertEqual(mock_conn.read.call_count, 1)
+    
+    def test_send_request_drains_stale_bytes(self):
+        """Test that bytes pending before a request are read off instead of flushed"""
+        client = ModbusRTU(port='/dev/ttyUSB0', baudrate=9600, timeout=1.0)
+        frame = b'\x01\x03\x02\x00\x2a'
+        frame += struct.pack('<H', client._calculate_crc(frame))
+        mock_conn = MagicMock()
+        mock_conn.is_open = True
+        mock_conn.in_waiting = 2
+        mock_conn.timeout = 1.0
+        mock_conn.read.side_effect = [b'\xff\xff', frame[:3], frame[3:]]
+        client.serial_conn = mock_conn
+        client.rs485_delay = 0
+        
+        request = client._build_request(1, 0x03, struct.pack('>HH', 0, 1))
+        with self.assertLogs(client.device_logger, 'WARNING'):
+            self.assertEqual(client.send_request(request, 1, 0x03, retry_count=0), frame)
+        mock_conn.read.assert_any_call(2)
+        mock_conn.reset_input_buffer.assert_not_called()
+
+    def test_send_request_post_write_delay(self):
+        """Test that the pause after writing is opt-in"""
+        client = ModbusRTU(port='/dev/ttyUSB0', baudrate=9600, timeout=1.0, rs485_delay=0)
+        frame = b'\x01\x06\x00\x00\x00\x07'
+        frame += struct.pack('<H', client._calculate_crc(frame))
+        mock_conn = MagicMock(is_open=True, in_waiting=0, timeout=1.0)
+        client.serial_conn = mock_conn
+
+        for delay, expected_sleeps in ((0.0, []), (0.02, [call(0.02)])):
+            client.post_write_delay = delay
+            mock_conn.read.side_effect = [frame[:3], frame[3:]]
+            with patch('modapi.rtu.base.time.sleep') as mock_sleep:
+                self.assertEqual(client.send_request(frame, 1, 0x06, retry_count=0), frame)
+            self.assertEqual(mock_sleep.call_args_list, expected_sleeps)
+
+    def test_read_coils_remembers_dialect(self):
+        """Test that the function code variant that answered is tried first next time"""
+        client = ModbusRTU(port='/dev/ttyUSB0', baudrate=9600, timeout=1.0)
+        client.serial_conn = MagicMock(is_open=True)
+        frame = b'\x01\x41\x01\x05'
+        response = frame + struct.pack('<H', client._calculate_crc(frame))
+        
+        with patch.object(client, 'send_request', side_effect=[None, response]) as mock_send:
+            self.assertEqual(client.read_coils(1, 0, 3), [True, False, True])
+        self.assertEqual([c.args[2] for c in mock_send.call_args_list], [0x01, 0x41])
+        
+        with patch.object(client, 'send_request', return_value=response) as mock_send:
+            self.assertEqual(client.read_coils(1, 0, 3), [True, False, True])
+        self.assertEqual([c.args[2] for c in mock_send.call_args_list], [0x41])
+
+    def test_read_fallbacks_back_off_for_silent_unit(self):
+        """Test that fallbacks are spaced out and a silent unit stops getting other-unit probes"""
+        client = ModbusRTU(port='/dev/ttyUSB0', baudrate=9600, timeout=1.0)
+        client.serial_conn = MagicMock(is_open=True)
+
+        with patch.object(client, 'send_request', return_value=None) as mock_send, \
+                patch('modapi.rtu.base.time.sleep') as mock_sleep:
+            client.read_holding_registers(7, 0, 1)
+            self.assertEqual([c.args[1] for c in mock_send.call_args_list], [7, 7, 0])
+            self.assertEqual([c.args[0] for c in mock_sleep.call_args_list], [0.01, 0.02])
+
+            client.read_holding_registers(7, 0, 1)
+            client.read_holding_registers(7, 0, 1)
+            mock_send.reset_mock()
+            client.read_holding_registers(7, 0, 1)
+            self.assertEqual([c.args[1] for c in mock_send.call_args_list], [7, 7])
+
     def test_read_coils_invalid_count(self):
         """Test reading coils with invalid count"""
         result = self.client.read_coils(1, 0, 0)
@@ -241,6 +435,114 @@ class TestModbusRTU(unittest.TestCase):
         result = self.client.read_holding_registers(1, 0, 200)
         self.assertEqual(result, [])  # Returns empty list for invalid count
     
+    def test_read_holding_registers_multi(self):
+        """Test that nearby register ranges are coalesced into one read"""
+        with patch.object(self.client, 'read_holding_registers', return_value=list(range(100, 112))) as mock_read:
+            result = self.client.read_holding_registers_multi(1, [(10, 2), (0, 4)], max_gap=8)
+        
+        mock_read.assert_called_once_with(1, 0, 12)
+        self.assertEqual(result, [[110, 111], [100, 101, 102, 103]])
+        
+        with patch.object(self.client, 'read_holding_registers', return_value=[1, 2]) as mock_read:
+            self.client.read_holding_registers_multi(1, [(10, 2), (0, 4)], max_gap=0)
+        self.assertEqual(mock_read.call_count, 2)
+    
+    def test_read_holding_registers_batched(self):
+        """Test that single-register reads are batched and scattered back by address"""
+        with patch.object(self.client, 'read_holding_registers', return_value=[7, 8, 9, 10, 11]) as mock_read:
+            result = self.client.read_holding_registers_batched(1, [14, 10, 12])
+        
+        mock_read.assert_called_once_with(1, 10, 5)
+        self.assertEqual(result, [11, 7, 9])
+
+    def test_read_coils_multi(self):
+        """Test that nearby coil ranges share one read and distant ones get their own"""
+        with patch.object(self.client, 'read_coils', side_effect=lambda unit_id, start, count: [True] * count) as mock_read:
+            result = self.client.read_coils_multi(1, [(20, 2), (0, 8), (1990, 20)])
+
+        self.assertEqual(mock_read.call_args_list, [call(1, 0, 22), call(1, 1990, 20)])
+        self.assertEqual(result, [[True] * 2, [True] * 8, [True] * 20])
+
+    def test_read_cache_ttl(self):
+        """Test that repeated reads within the TTL skip the bus and writes invalidate them"""
+        self.client.serial_conn = MagicMock(is_open=True)
+        response = bytearray(b'\x01\x03\x02\x00\x2a\x38\x5b')
+        self.client.set_read_ttl(10.0)
+
+        with patch.object(self.client, 'send_request', return_value=response) as mock_send:
+            self.assertEqual(self.client.read_holding_registers(1, 0, 1), [42])
+            self.assertEqual(self.client.read_holding_registers(1, 0, 1), [42])
+            self.assertEqual(mock_send.call_count, 1)
+
+            self.client.write_single_register(1, 0, 7)
+            self.client.read_holding_registers(1, 0, 1)
+            self.assertEqual(mock_send.call_count, 3)
+
+            # A broadcast write reaches every unit, so it drops their cached reads too
+            self.client.read_holding_registers(1, 0, 1)  # Still cached
+            self.client.write_single_register(0, 0, 7)
+            self.client.read_holding_registers(1, 0, 1)
+            self.assertEqual(mock_send.call_count, 5)
+
+            # A per-register TTL of 0 keeps ranges containing it uncached
+            self.client.set_register_ttl(0, 0)
+            self.client.read_holding_registers(1, 0, 1)
+            self.client.read_holding_registers(1, 0, 1)
+            self.assertEqual(mock_send.call_count, 7)
+
+    @patch('modapi.rtu.base.time.sleep')
+    def test_unreachable_unit_recovers(self, mock_sleep):
+        """Test that a silent unit loses its fallbacks only until the expiry or a success"""
+        from modapi.rtu import base
+
+        self.client.serial_conn = MagicMock(is_open=True)
+        dialects = [(1, 0x03), (0, 0x03)]
+        with patch.object(self.client, 'send_request', return_value=None) as mock_send:
+            for _ in range(base._UNREACHABLE_AFTER):
+                self.client._read_with_fallbacks(0x03, 1, 0, 1, dialects)
+            mock_send.reset_mock()
+            self.client._read_with_fallbacks(0x03, 1, 0, 1, dialects)
+            self.assertEqual([c.args[1] for c in mock_send.call_args_list], [1])  # Own ID only
+
+            # Backoff grows with the failures but stays under the cap
+            self.assertEqual(self.client._fallback_delay(1, 0), 0.01)
+            self.assertEqual(self.client._fallback_delay(1, 1), 0.02)
+            self.assertEqual(self.client._fallback_delay(3, 1000), self.client._fallback_backoff_cap)
+
+            # The broadcast fallback comes back once the expiry has passed...
+            mock_send.reset_mock()
+            later = time.monotonic() + base._UNREACHABLE_TTL + 1
+            with patch('modapi.rtu.base.time.monotonic', return_value=later):
+                self.client._read_with_fallbacks(0x03, 1, 0, 1, dialects)
+            self.assertEqual([c.args[1] for c in mock_send.call_args_list], [1, 0])
+
+        # ...and a successful read clears the failure count
+        response = bytearray(b'\x01\x03\x02\x00\x2a\x38\x5b')
+        with patch.object(self.client, 'send_request', return_value=response):
+            self.client._read_with_fallbacks(0x03, 1, 0, 1, dialects)
+        self.assertNotIn(1, self.client._unit_failures)
+
+    def test_register_ttl_scope(self):
+        """Test that per-register TTLs only apply to their read kind and unit"""
+        self.client.serial_conn = MagicMock(is_open=True)
+        self.client.set_read_ttl(10.0)
+        self.client.set_register_ttl(0, 0, kind=0x03, unit_id=1)
+
+        self.assertEqual(self.client._range_ttl(1, 0x03, 0, 4), 0)
+        self.assertEqual(self.client._range_ttl(2, 0x03, 0, 4), 10.0)  # Other unit
+        self.assertEqual(self.client._range_ttl(1, 0x01, 0, 4), 10.0)  # Coil 0
+        self.assertEqual(self.client._range_ttl(1, 0x03, 1, 4), 10.0)  # Range without it
+
+        # Covering the whole range, an override may also lengthen the lifetime
+        self.client.set_register_ttl(5, 60.0, kind=0x04)
+        self.assertEqual(self.client._range_ttl(3, 0x04, 5, 1), 60.0)
+
+        # Cached responses are immutable, so callers cannot corrupt each other's hits
+        response = bytearray(b'\x02\x03\x02\x00\x2a\x3d\x9b')
+        with patch.object(self.client, 'send_request', return_value=response):
+            self.client.read_holding_registers(2, 0, 1)
+        self.assertIsInstance(self.client._read_cache[(2, 0x03, 0, 1)][1], bytes)
+
     def test_not_connected_operations(self):
         """Test operations when not connected"""
         # Ensure not connected
@@ -261,6 +563,8 @@ class TestModbusRTU(unittest.TestCase):
     @patch('serial.Serial')
     def test_port_exists(self, mock_serial):
         """Test port existence checking"""
+        invalidate_port_cache()
+        
         # Mock successful port check
         mock_serial.return_value.is_open = True
         self.assertTrue(self.client._port_exists('/dev/ttyUSB0'))
@@ -326,6 +630,279 @@ class TestConvenienceFunctions(unittest.TestCase):
         mock_client.read_holding_registers.assert_not_called()
 
 
+class TestScanUtils(unittest.TestCase):
+    """Test cases for the port scanning helpers"""
+    
+    @patch('modapi.rtu.utils._baudrate_looks_live', return_value=True)
+    @patch('modapi.rtu.utils.serial.Serial')
+    @patch('modapi.rtu.utils._probe_modbus')
+    def test_scan_for_devices(self, mock_probe, mock_serial, mock_looks_live):
+        """Test that only ports with a responding device are reported"""
+        def open_port(port, baudrate, timeout):
+            ser = MagicMock(port=port)
+            ser.__enter__.return_value = ser
+            return ser
+        mock_serial.side_effect = open_port
+        mock_probe.side_effect = lambda ser, baudrate, unit_id=1: ser.port == '/dev/ttyUSB1' and baudrate == 19200
+        
+        devices = scan_for_devices(['/dev/ttyUSB0', '/dev/ttyUSB1'], [9600, 19200], [1])
+        
+        self.assertEqual(len(devices), 1)
+        self.assertEqual(devices[0]['port'], '/dev/ttyUSB1')
+        self.assertEqual(devices[0]['baudrate'], 19200)
+        self.assertEqual(devices[0]['unit_ids'], [1])
+        # One open per port, whatever the number of baudrates
+        self.assertEqual(mock_serial.call_count, 2)
+    
+    @patch('modapi.rtu.utils.serial.tools.list_ports.comports')
+    @patch('modapi.rtu.utils._scan_one_port')
+    def test_scan_for_devices_baudrate_cache(self, mock_scan_port, mock_comports):
+        """Test that a re-scan with a cache file tries the last-known-good baudrate first"""
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        cache_file = os.path.join(cache_dir.name, 'modapi', 'baudrates.json')
+        invalidate_port_cache()
+        self.addCleanup(invalidate_port_cache)
+        mock_comports.return_value = [MagicMock(device='/dev/ttyUSB0', serial_number='A1B2')]
+        mock_scan_port.side_effect = lambda port, baudrates, unit_ids, **kwargs: {
+            'port': port, 'baudrate': 19200, 'unit_id': 1, 'unit_ids': [1]}
+        
+        # Without a cache file the scan neither enumerates ports nor writes anything
+        scan_for_devices(['/dev/ttyUSB0'], [9600, 19200, 38400], [1])
+        mock_comports.assert_not_called()
+        
+        scan_for_devices(['/dev/ttyUSB0'], [9600, 19200, 38400], [1], cache_file=cache_file)
+        self.assertEqual(mock_scan_port.call_args[0][1], [9600, 19200, 38400])
+        self.assertTrue(os.path.exists(cache_file))
+        
+        # The adapter moved to another device node but keeps its serial number
+        invalidate_port_cache()
+        mock_comports.return_value = [MagicMock(device='/dev/ttyUSB1', serial_number='A1B2')]
+        scan_for_devices(['/dev/ttyUSB1'], [9600, 19200, 38400], [1], cache_file=cache_file)
+        self.assertEqual(mock_scan_port.call_args[0][1], [19200, 9600, 38400])
+        # Serial numbers come from the cached port enumeration
+        self.assertEqual(mock_comports.call_count, 2)
+    
+    @patch('modapi.rtu.utils._scan_one_port')
+    def test_find_first_device_priority_order(self, mock_scan_port):
+        """Test that the first port in priority order wins and no probe outlives the call"""
+        from modapi.rtu.utils import find_first_device
+        
+        stopped = []
+        def scan_port(port, baudrates, unit_ids, all_units=True, stop=None):
+            if port == '/dev/ttyUSB2':  # Would keep probing until told to stop
+                stopped.append(stop.wait(5))
+                return None
+            if port == '/dev/ttyACM0':
+                time.sleep(0.1)  # Answers after the lower-priority ttyUSB0
+            return {'port': port, 'baudrate': 9600, 'unit_id': 1, 'unit_ids': [1]}
+        mock_scan_port.side_effect = scan_port
+        
+        result = find_first_device(['/dev/ttyACM0', '/dev/ttyUSB0', '/dev/ttyUSB2'], [9600], [1])
+        
+        self.assertEqual(result['port'], '/dev/ttyACM0')
+        self.assertEqual(stopped, [True])  # Finished before find_first_device returned
+        self.assertFalse(mock_scan_port.call_args.kwargs['all_units'])
+    
+    @patch('modapi.rtu.utils._read_rtu_frame')
+    def test_probe_modbus_remembers_function_code(self, mock_read_frame):
+        """Test that the function code that answered is probed first next time"""
+        from modapi.rtu.utils import _probe_modbus
+        
+        ser = MagicMock(port='/dev/ttyUSB7')
+        # Only coil reads (FC01) are answered
+        mock_read_frame.side_effect = lambda ser, baudrate, length: (
+            b'\x01\x01\x01\x00\x51\x88' if ser.write.call_args[0][0][1] == 0x01 else b'')
+        
+        self.assertTrue(_probe_modbus(ser, 9600))
+        self.assertEqual(ser.write.call_count, 2)
+        
+        ser.write.reset_mock()
+        self.assertTrue(_probe_modbus(ser, 9600))
+        self.assertEqual(ser.write.call_count, 1)
+    
+    @patch('modapi.rtu.utils._read_rtu_frame')
+    def test_baudrate_looks_live(self, mock_read_frame):
+        """Test that only bytes without a CRC-valid frame reject a baudrate"""
+        ser = MagicMock(port='/dev/ttyUSB0')
+        mock_read_frame.return_value = b''
+        self.assertTrue(_baudrate_looks_live(ser, 9600, 5))
+        self.assertEqual(ser.write.call_args[0][0][0], 5)  # Addressed to the unit, not broadcast
+        
+        mock_read_frame.return_value = b'\xff\xfe\x00\x80'
+        self.assertFalse(_baudrate_looks_live(ser, 9600))
+        
+        # Plausible unit ID and function code, but noise rather than a frame
+        mock_read_frame.return_value = b'\x01\x03\x02\x00\x01\x00\x00'
+        self.assertFalse(_baudrate_looks_live(ser, 9600))
+        
+        mock_read_frame.return_value = b'\x00\x01\x03\x02\x00\x01\x79\x84'
+        self.assertTrue(_baudrate_looks_live(ser, 9600))
+        
+        # Listens for a few character times, not the full probe timeout
+        self.assertLess(mock_read_frame.call_args.kwargs['response_timeout'], 0.02)
+    
+    def test_read_rtu_frame(self):
+        """Test that a frame is read until the line goes silent"""
+        ser = MagicMock()
+        ser.timeout = 0.5
+        ser.read.side_effect = [b'\x01', b'\x03\x02', b'\x00\x01\x79\x84', b'']
+        
+        self.assertEqual(_read_rtu_frame(ser, 115200), b'\x01\x03\x02\x00\x01\x79\x84')
+        self.assertEqual(ser.timeout, 0.5)  # Original timeout restored
+        
+        ser.read.side_effect = [b'']
+        self.assertEqual(_read_rtu_frame(ser, 9600), b'')
+        
+        # Known length: the rest of the frame is fetched once the header is in
+        ser.read.side_effect = [b'\x01', b'\x03\x02', b'\x00\x01\x79\x84']
+        self.assertEqual(_read_rtu_frame(ser, 9600, 7), b'\x01\x03\x02\x00\x01\x79\x84')
+        ser.read.assert_called_with(4)
+        
+        # An exception reply is shorter than expected; no read waits for the missing bytes
+        ser.read.side_effect = [b'\x01', b'\x83\x02', b'\xc0\xf1']
+        self.assertEqual(_read_rtu_frame(ser, 9600, 7), b'\x01\x83\x02\xc0\xf1')
+        ser.read.assert_called_with(2)
+    
+    @patch('modapi.rtu.utils.serial.Serial')
+    def test_modbus_port_timeout(self, mock_serial):
+        """Test that test_modbus_port waits with its timeout and sets it only once"""
+        from modapi.rtu.utils import test_modbus_port
+        
+        class Port(MagicMock):
+            timeout_sets = []
+            timeout = property(lambda self: 0.3, lambda self, value: self.timeout_sets.append(value))
+        ser = Port(port='/dev/ttyUSB5')
+        ser.__enter__.return_value = ser
+        ser.read.return_value = b''
+        mock_serial.return_value = ser
+        
+        success, _ = test_modbus_port('/dev/ttyUSB5', 9600, timeout=0.3)
+        
+        self.assertFalse(success)
+        self.assertEqual(mock_serial.call_args.kwargs['timeout'], 0.3)
+        self.assertEqual(Port.timeout_sets, [])  # Never reprogrammed per probe
+    
+    def test_read_exact(self):
+        """Test that reads continue until the requested byte count arrives"""
+        from modapi.rtu.utils import read_exact
+        
+        ser = MagicMock()
+        ser.read.side_effect = [b'\x01\x06', b'\x00\x01\x00', b'\x03\x98\x0b']
+        self.assertEqual(read_exact(ser, 8, time.monotonic() + 1.0), b'\x01\x06\x00\x01\x00\x03\x98\x0b')
+        self.assertEqual([c.args[0] for c in ser.read.call_args_list], [8, 6, 3])
+        
+        ser.read.side_effect = [b'\x01', b'']
+        self.assertEqual(read_exact(ser, 8, time.monotonic() + 1.0), b'\x01')
+    
+    @patch('modapi.rtu.utils.serial.tools.list_ports.comports')
+    def test_find_serial_ports_cached(self, mock_comports):
+        """Test that port enumeration is reused until invalidated"""
+        mock_comports.return_value = [MagicMock(device='/dev/ttyUSB0')]
+        invalidate_port_cache()
+        
+        ports = find_serial_ports()
+        ports.append('/dev/ttyUSB9')  # Callers get their own copy
+        self.assertEqual(find_serial_ports(), ['/dev/ttyUSB0'])
+        self.assertEqual(mock_comports.call_count, 1)
+        
+        invalidate_port_cache()
+        find_serial_ports()
+        self.assertEqual(mock_comports.call_count, 2)
+        invalidate_port_cache()
+
+
+class TestModbusRTUClient(unittest.TestCase):
+    """Test cases for the high-level RTU client"""
+    
+    @patch('modapi.rtu.utils._scan_one_port')
+    def test_auto_detect(self, mock_scan_port):
+        """Test that auto-detection probes each port once over one open handle"""
+        from modapi.rtu.client import ModbusRTUClient
+        
+        mock_scan_port.side_effect = lambda port, baudrates, unit_ids, **kwargs: (
+            {'port': port, 'baudrate': 19200, 'unit_id': 1, 'unit_ids': [1]} if port == '/dev/ttyUSB1' else None)
+        
+        config = ModbusRTUClient.auto_detect(['/dev/ttyUSB0', '/dev/ttyUSB1'])
+        
+        self.assertEqual(config, {'port': '/dev/ttyUSB1', 'baudrate': 19200, 'unit_id': 1})
+        self.assertEqual(mock_scan_port.call_count, 2)
+        self.assertIsNone(ModbusRTUClient.auto_detect([]))
+    
+    def test_send_raw_request(self):
+        """Test that a raw request returns the validated response frame"""
+        from modapi.rtu.client import ModbusRTUClient
+        from modapi.rtu.protocol import build_read_request
+        
+        client = ModbusRTUClient(port='/dev/ttyTEST', baudrate=9600)
+        client.serial_conn = MagicMock(timeout=1.0, is_open=True)
+        request = build_read_request(1, 0x03, 0, 1)
+        
+        client.serial_conn.read.side_effect = [b'\x01', b'\x03\x02\x00\x01\x79\x84']
+        self.assertEqual(client.send_raw_request(request, 1, 0x03), b'\x01\x03\x02\x00\x01\x79\x84')
+        
+        # Response from another unit
+        client.serial_conn.read.side_effect = [b'\x01', b'\x03\x02\x00\x01\x79\x84']
+        self.assertIsNone(client.send_raw_request(request, 2, 0x03))
+    
+    def test_read_input_registers_multi(self):
+        """Test that the client coalesces input register ranges with its own argument order"""
+        from modapi.rtu.client import ModbusRTUClient
+        
+        client = ModbusRTUClient(port='/dev/ttyTEST', baudrate=9600)
+        with patch.object(client, 'read_input_registers', return_value=[7, 8, 9, 10]) as mock_read:
+            result = client.read_input_registers_multi([(2, 2), (0, 1)], unit_id=3)
+        
+        mock_read.assert_called_once_with(0, 4, 3)
+        self.assertEqual(result, [[9, 10], [7]])
+
+
+@unittest.skipUnless(hasattr(os, 'openpty'), "Requires a pseudo-terminal")
+class TestAsyncModbusRTU(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the asyncio RTU client against a pseudo-terminal device"""
+    
+    async def test_read_holding_registers(self):
+        """Test that only the addressed unit's validated response is returned"""
+        import asyncio
+        import tty
+        from modapi.rtu.async_client import AsyncModbusRTU
+        from modapi.rtu.protocol import build_request
+        
+        master, slave = os.openpty()
+        self.addCleanup(os.close, master)
+        self.addCleanup(os.close, slave)
+        tty.setraw(master)
+        
+        def device():
+            # Unit 1 answers with a single register, other units stay silent
+            if os.read(master, 256)[0] == 1:
+                os.write(master, build_request(1, 0x03, b'\x02\x12\x34'))
+        loop = asyncio.get_running_loop()
+        loop.add_reader(master, device)
+        self.addCleanup(loop.remove_reader, master)
+        
+        async with AsyncModbusRTU(os.ttyname(slave), 9600, timeout=0.1) as client:
+            self.assertEqual(await client.read_holding_registers(1, 0, 1), [0x1234])
+            self.assertIsNone(await client.read_holding_registers(2, 0, 1))
+    
+    async def test_hangup_stops_watching_port(self):
+        """Test that a hang-up ends the wait and unregisters the reader instead of spinning"""
+        import asyncio
+        from modapi.rtu.async_client import AsyncModbusRTU
+        
+        master, slave = os.openpty()
+        self.addCleanup(os.close, slave)
+        
+        client = AsyncModbusRTU(os.ttyname(slave), 9600, timeout=5.0)
+        self.assertTrue(await client.connect())
+        asyncio.get_running_loop().call_later(0.05, os.close, master)  # Unplug the "adapter"
+        
+        start = time.monotonic()
+        self.assertIsNone(await client.read_holding_registers(1, 0, 1))
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertFalse(client.is_connected())
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests (requires physical hardware or mock)"""
     
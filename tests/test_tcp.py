@@ -0,0 +1,62 @@
+"""
+Tests for api.tcp module - Modbus TCP Communication
+"""
+
+import unittest
+from unittest.mock import MagicMock
+import struct
+
+from modapi.api.tcp import ModbusTCP
+
+
+class TestModbusTCP(unittest.TestCase):
+    """Test cases for ModbusTCP class"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.client = ModbusTCP(host='127.0.0.1', port=502, timeout=1.0)
+
+    def _register_response(self, values):
+        """Build a read registers response payload (byte count + data)"""
+        return bytes([len(values) * 2]) + struct.pack(f'>{len(values)}H', *values)
+
+    def test_read_holding_registers(self):
+        """Test reading holding registers"""
+        self.client._send_request = MagicMock(return_value=self._register_response([0x1234, 0x5678]))
+
+        result = self.client.read_holding_registers(1, 0, 2)
+
+        self.assertEqual(result, [0x1234, 0x5678])
+        self.client._send_request.assert_called_once_with(1, 0x03, struct.pack('>HH', 0, 2))
+
+    def test_read_holding_registers_short_response(self):
+        """Test that a truncated registers response is rejected"""
+        self.client._send_request = MagicMock(return_value=b'\x04\x12\x34')
+
+        self.assertIsNone(self.client.read_holding_registers(1, 0, 2))
+
+    def test_read_coils(self):
+        """Test that coil bits are unpacked LSB first and missing bytes read as False"""
+        self.client._send_request = MagicMock(return_value=b'\x01\x05')
+        self.assertEqual(self.client.read_coils(1, 0, 10), [True, False, True] + [False] * 7)
+
+    def test_read_holding_registers_multi(self):
+        """Test that adjacent register ranges are coalesced into one request"""
+        self.client._send_request = MagicMock(return_value=self._register_response(list(range(10, 16))))
+
+        result = self.client.read_holding_registers_multi(1, [(4, 2), (0, 2), (2, 2)])
+
+        self.assertEqual(result, [[14, 15], [10, 11], [12, 13]])
+        self.client._send_request.assert_called_once_with(1, 0x03, struct.pack('>HH', 0, 6))
+
+    def test_write_single_register(self):
+        """Test writing a single register validates the echo"""
+        self.client._send_request = MagicMock(return_value=struct.pack('>HH', 1, 0x1234))
+        self.assertTrue(self.client.write_single_register(1, 1, 0x1234))
+
+        self.client._send_request = MagicMock(return_value=struct.pack('>HH', 1, 0x4321))
+        self.assertFalse(self.client.write_single_register(1, 1, 0x1234))
+
+
+if __name__ == '__main__':
+    unittest.main()